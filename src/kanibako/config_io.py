@@ -11,6 +11,11 @@ from pathlib import Path
 
 import yaml
 
+# Prefer the libyaml-backed C loader/dumper; fall back to pure Python when
+# PyYAML was built without libyaml.
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 
 def load_doc(path: Path | None) -> dict:
     """Load a config document → dict. Missing/empty/non-mapping → {}."""
@@ -18,11 +23,11 @@ def load_doc(path: Path | None) -> dict:
         return {}
     text = path.read_text()
     # Defensive: only parse real text. A non-str (e.g. a MagicMock from an
-    # under-mocked test path) fed to yaml.safe_load can balloon memory
+    # under-mocked test path) fed to the YAML loader can balloon memory
     # catastrophically — guard the host instead of trusting the input.
     if not isinstance(text, str):
         return {}
-    data = yaml.safe_load(text)
+    data = yaml.load(text, Loader=_Loader)
     return data if isinstance(data, dict) else {}
 
 
@@ -30,7 +35,8 @@ def dump_doc(path: Path, data: dict) -> None:
     """Serialize *data* to *path* as YAML (creates parent dirs)."""
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(
-        yaml.safe_dump(
-            data, sort_keys=False, default_flow_style=False, allow_unicode=True,
+        yaml.dump(
+            data, Dumper=_Dumper,
+            sort_keys=False, default_flow_style=False, allow_unicode=True,
         )
     )
@@ -122,7 +122,7 @@ class ProjectGroup:
     local_shared_base: Path
 
 
-@dataclass
+@dataclass(slots=True)
 class ProjectPaths:
     """Resolved paths for a specific project."""
 
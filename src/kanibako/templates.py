@@ -5,6 +5,8 @@ from __future__ import annotations
 import shutil
 from pathlib import Path
 
+from kanibako.utils import copy_file
+
 
 def resolve_template(
     templates_base: Path,
@@ -54,7 +56,7 @@ def apply_shell_template(
     # Layer 1: general/base (if it exists)
     base_dir = templates_base / "general" / "base"
     if base_dir.is_dir():
-        shutil.copytree(str(base_dir), str(shell_path), dirs_exist_ok=True)
+        shutil.copytree(base_dir, shell_path, copy_function=copy_file, dirs_exist_ok=True)
 
     # Layer 2: resolved template
-    shutil.copytree(str(resolved), str(shell_path), dirs_exist_ok=True)
+    shutil.copytree(resolved, shell_path, copy_function=copy_file, dirs_exist_ok=True)
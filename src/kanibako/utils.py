@@ -1,10 +1,13 @@
-"""Utility functions: cp_if_newer, confirm_prompt, short_hash, path encoding, container naming."""
+"""Utility functions: cp_if_newer, copy_file, confirm_prompt, short_hash, path encoding, container naming."""
 
 from __future__ import annotations
 
+import functools
 import hashlib
 import os
+import re
 import shutil
+import stat
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -14,26 +17,63 @@ if TYPE_CHECKING:
     from kanibako.paths import ProjectPaths
 
 
+def copy_file(
+    src: str | os.PathLike,
+    dst: str | os.PathLike,
+    src_st: os.stat_result | None = None,
+) -> str | os.PathLike:
+    """Copy *src* to *dst*, preserving permission bits and timestamps.
+
+    ``shutil.copyfile`` keeps the data in the kernel (``os.sendfile`` on
+    Linux, ``fcopyfile`` on macOS).  Unlike ``shutil.copy2`` the source is
+    stat'ed at most once (not at all if *src_st* is given) and extended
+    attributes/flags are not copied.  Returns *dst*, so it can be passed as
+    ``copy_function`` to ``shutil.copytree``.
+    """
+    if src_st is None:
+        src_st = os.stat(src)
+    shutil.copyfile(src, dst)
+    os.chmod(dst, stat.S_IMODE(src_st.st_mode))
+    os.utime(dst, ns=(src_st.st_atime_ns, src_st.st_mtime_ns))
+    return dst
+
+
 def cp_if_newer(src: str | os.PathLike, dst: str | os.PathLike) -> bool:
     """Copy *src* to *dst* only if *src* is strictly newer (by mtime).
 
-    Creates parent directories for *dst* if needed.
+    Creates parent directories for *dst* if needed.  If *dst* is an existing
+    directory, *src* is always copied into it (like ``shutil.copy2``).
     Returns True if the copy was performed.
     """
-    src_s = str(src)
-    dst_s = str(dst)
-    if not os.path.isfile(src_s):
+    src_s = os.fspath(src)
+    dst_s = os.fspath(dst)
+    try:
+        src_st = os.stat(src_s)
+    except OSError:
         return False
+    if not stat.S_ISREG(src_st.st_mode):
+        return False
+    try:
+        dst_st: os.stat_result | None = os.stat(dst_s)
+    except OSError:
+        dst_st = None
     do_copy = (
-        not os.path.isfile(dst_s)
-        or os.stat(src_s).st_mtime > os.stat(dst_s).st_mtime
+        dst_st is None
+        or not stat.S_ISREG(dst_st.st_mode)
+        or src_st.st_mtime_ns > dst_st.st_mtime_ns
     )
     if do_copy:
-        os.makedirs(os.path.dirname(dst_s) or ".", exist_ok=True)
-        shutil.copy2(src_s, dst_s)
+        if dst_st is not None and stat.S_ISDIR(dst_st.st_mode):
+            dst_s = os.path.join(dst_s, os.path.basename(src_s))
+        else:
+            os.makedirs(os.path.dirname(dst_s) or ".", exist_ok=True)
+        copy_file(src_s, dst_s, src_st)
     return do_copy
 
 
+_CONFIRM_MAX_LEN = 16
+
+
 def confirm_prompt(message: str) -> None:
     """Print *message*, read a line, raise UserCancelled unless it is 'yes'."""
     print(message, end="", flush=True)
@@ -42,7 +82,9 @@ def confirm_prompt(message: str) -> None:
     except (EOFError, KeyboardInterrupt):
         print()
         raise UserCancelled("Aborted.")
-    if response.strip() != "yes":
+    # Anything longer than a padded "yes" is a rejection; don't strip() a
+    # large pasted/piped input just to find that out.
+    if len(response) > _CONFIRM_MAX_LEN or response.strip() != "yes":
         raise UserCancelled("Aborted.")
 
 
@@ -59,16 +101,36 @@ def container_name_for(proj: ProjectPaths) -> str:
     - Workset: ``kanibako-{short_hash}`` (name-based pending workset naming)
     - Standalone: ``kanibako-ronin-{escape_path(project_path)}``
     """
-    if proj.mode.value == "standalone":
-        return f"kanibako-ronin-{escape_path(str(proj.project_path))}"
-    if proj.name:
-        return f"kanibako-{proj.name}"
-    return f"kanibako-{short_hash(proj.project_hash)}"
+    return _container_name(
+        proj.mode.value, proj.name, str(proj.project_path), proj.project_hash,
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _container_name(mode: str, name: str, project_path: str, phash: str) -> str:
+    """Cached body of :func:`container_name_for`, keyed on the fields it reads."""
+    if mode == "standalone":
+        return f"kanibako-ronin-{escape_path(project_path)}"
+    if name:
+        return f"kanibako-{name}"
+    return f"kanibako-{phash[:8]}"
+
+
+# Empty hasher cloned by project_hash(); copy() is cheaper than constructing
+# a fresh SHA-256 context for every short path.
+_SHA256_BASE = hashlib.sha256(usedforsecurity=False)
 
 
+@functools.lru_cache(maxsize=256)
 def project_hash(project_path: str) -> str:
-    """SHA-256 hex digest of the project path string."""
-    return hashlib.sha256(project_path.encode()).hexdigest()
+    """SHA-256 hex digest of the project path string.
+
+    The hash only names directories and containers, so it is computed with
+    ``usedforsecurity=False``.  Results are cached per path.
+    """
+    h = _SHA256_BASE.copy()
+    h.update(os.fsencode(project_path))
+    return h.hexdigest()
 
 
 # ---------------------------------------------------------------------------
@@ -76,6 +138,7 @@ def project_hash(project_path: str) -> str:
 # ---------------------------------------------------------------------------
 
 _DASH_ESCAPE = "-."
+_ESCAPED_SEP_RE = re.compile(r"-(\.?)")
 
 
 def escape_path(path: str) -> str:
@@ -87,24 +150,21 @@ def escape_path(path: str) -> str:
 
     Example: ``/home/user/my-project/app`` → ``home-user-my.-project-app``
     """
-    path = path.lstrip("/")
-    path = path.replace("-", _DASH_ESCAPE)
-    path = path.replace("/", "-")
-    return path
+    return path.lstrip("/").replace("-", _DASH_ESCAPE).replace("/", "-")
+
+
+def _unescape_sep(match: re.Match[str]) -> str:
+    return "-" if match.group(1) else "/"
 
 
 def unescape_path(encoded: str) -> str:
     """Decode a container-name-encoded path back to a filesystem path.
 
     Reverses ``escape_path``: ``-.`` → ``-``, lone ``-`` → ``/``,
-    prepends ``/``.
+    prepends ``/``.  Done in a single regex pass, so no sentinel character
+    is needed to keep the two rewrites apart.
     """
-    # Use a sentinel to avoid double-replacement.
-    sentinel = "\x00"
-    result = encoded.replace(_DASH_ESCAPE, sentinel)
-    result = result.replace("-", "/")
-    result = result.replace(sentinel, "-")
-    return "/" + result
+    return "/" + _ESCAPED_SEP_RE.sub(_unescape_sep, encoded)
 
 
 # ---------------------------------------------------------------------------
@@ -19,6 +19,8 @@ names to root paths so they can be discovered from anywhere.
 
 from __future__ import annotations
 
+import contextlib
+import os
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
@@ -47,17 +49,22 @@ class WorksetProject:
     source_path: Path   # original project path (for reference / cloning)
 
 
-@dataclass
+@dataclass(slots=True)
 class Workset:
     """In-memory representation of a workset."""
 
     name: str
     root: Path
     created: str                            # ISO 8601, UTC
-    projects: list[WorksetProject] = field(default_factory=list)
+    projects_by_name: dict[str, WorksetProject] = field(default_factory=dict)
     group_auth: bool = field(default=True)  # True = shared creds, False = distinct
     is_default: bool = False                 # True = synthesized default workset
 
+    @property
+    def projects(self) -> list[WorksetProject]:
+        """Projects in registration order."""
+        return list(self.projects_by_name.values())
+
     # Convenience paths -------------------------------------------------------
 
     @property
@@ -106,15 +113,16 @@ def _load_workset_toml(root: Path) -> Workset:
         raise WorksetError(f"workset.yaml in {root} has no 'name' key")
     created = data.get("created", "")
     group_auth = bool(data.get("group_auth", True))
-    projects = []
+    projects = {}
     for entry in data.get("projects", []):
-        projects.append(
-            WorksetProject(
-                name=entry["name"],
-                source_path=Path(entry["source_path"]),
-            )
+        projects[entry["name"]] = WorksetProject(
+            name=entry["name"],
+            source_path=Path(entry["source_path"]),
         )
-    return Workset(name=name, root=root, created=created, projects=projects, group_auth=group_auth)
+    return Workset(
+        name=name, root=root, created=created,
+        projects_by_name=projects, group_auth=group_auth,
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -173,9 +181,10 @@ def create_workset(name: str, root: Path, std: StandardPaths) -> Workset:
         raise WorksetError(f"Workset root already exists: {root}")
 
     # Create directory skeleton.
-    root.mkdir(parents=True)
+    root_s = os.fspath(root)
+    os.makedirs(root_s)
     for subdir in ("boxes", "workspaces", "vault"):
-        (root / subdir).mkdir()
+        os.mkdir(os.path.join(root_s, subdir))
 
     ws = Workset(
         name=name,
@@ -230,10 +239,10 @@ def default_workset(std: StandardPaths) -> Workset:
     workset.yaml / registry write).
     """
     projects_map = read_names(std.data_path).get("projects", {})
-    projects = [
-        WorksetProject(name=name, source_path=Path(path))
+    projects = {
+        name: WorksetProject(name=name, source_path=Path(path))
         for name, path in projects_map.items()
-    ]
+    }
 
     group_auth = True
     config_path = std.data_path / "config.yaml"
@@ -250,7 +259,7 @@ def default_workset(std: StandardPaths) -> Workset:
         name=DEFAULT_WORKSET_ID,
         root=std.data_path,
         created="",
-        projects=projects,
+        projects_by_name=projects,
         group_auth=group_auth,
         is_default=True,
     )
@@ -298,21 +307,23 @@ def add_project(ws: Workset, name: str, source_path: Path) -> WorksetProject:
 
     Raises ``WorksetError`` if a project with *name* already exists.
     """
-    for p in ws.projects:
-        if p.name == name:
-            raise WorksetError(
-                f"Project '{name}' already exists in workset '{ws.name}'."
-            )
+    if name in ws.projects_by_name:
+        raise WorksetError(
+            f"Project '{name}' already exists in workset '{ws.name}'."
+        )
 
-    # Create per-project directories.
+    # Create per-project directories.  The vault/{name} parent is made once
+    # so its ro/ and rw/ children need only a single mkdir each.
     for parent in (ws.projects_dir, ws.workspaces_dir):
-        (parent / name).mkdir(parents=True, exist_ok=True)
-    vault_proj = ws.vault_dir / name
-    (vault_proj / "ro").mkdir(parents=True, exist_ok=True)
-    (vault_proj / "rw").mkdir(parents=True, exist_ok=True)
+        os.makedirs(os.path.join(parent, name), exist_ok=True)
+    vault_proj = os.path.join(ws.vault_dir, name)
+    os.makedirs(vault_proj, exist_ok=True)
+    for sub in ("ro", "rw"):
+        with contextlib.suppress(FileExistsError):
+            os.mkdir(os.path.join(vault_proj, sub))
 
     proj = WorksetProject(name=name, source_path=source_path.resolve())
-    ws.projects.append(proj)
+    ws.projects_by_name[name] = proj
     _write_workset_toml(ws)
     return proj
 
@@ -324,24 +335,19 @@ def remove_project(
 
     Raises ``WorksetError`` if no project with *name* exists.
     """
-    target = None
-    for p in ws.projects:
-        if p.name == name:
-            target = p
-            break
+    target = ws.projects_by_name.pop(name, None)
     if target is None:
         raise WorksetError(
             f"Project '{name}' not found in workset '{ws.name}'."
         )
 
-    ws.projects.remove(target)
     _write_workset_toml(ws)
 
     if remove_files:
         import shutil
         for parent in (ws.projects_dir, ws.workspaces_dir, ws.vault_dir):
-            proj_dir = parent / name
-            if proj_dir.is_dir():
+            proj_dir = os.path.join(parent, name)
+            if os.path.isdir(proj_dir):
                 shutil.rmtree(proj_dir)
 
     return target
@@ -5,7 +5,10 @@ from __future__ import annotations
 pytest_plugins = ["tests.conftest_integration"]
 
 import json
+import os
+import shutil
 import subprocess
+import tempfile
 from contextlib import contextmanager
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
@@ -15,38 +18,88 @@ import pytest
 from kanibako.config import KanibakoConfig, load_config, write_global_config
 
 
-@pytest.fixture
-def tmp_home(tmp_path, monkeypatch):
-    """Set HOME, XDG dirs, and CWD to an isolated temp tree."""
-    home = tmp_path / "home"
-    home.mkdir()
-    config_home = tmp_path / "config"
-    data_home = tmp_path / "data"
-    state_home = tmp_path / "state"
-    cache_home = tmp_path / "cache"
-    for d in (config_home, data_home, state_home, cache_home):
-        d.mkdir()
+_TMPFS_BASETEMP = pytest.StashKey[str]()
+_TMPFS_MIN_FREE = 1 << 30  # a full run writes ~800MB under basetemp
+
 
-    monkeypatch.setenv("HOME", str(home))
-    monkeypatch.setenv("XDG_CONFIG_HOME", str(config_home))
-    monkeypatch.setenv("XDG_DATA_HOME", str(data_home))
-    monkeypatch.setenv("XDG_STATE_HOME", str(state_home))
-    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """Opt-in: put this run's basetemp on tmpfs when ``KANIBAKO_TEST_TMPFS`` is set.
 
-    project = tmp_path / "project"
-    project.mkdir()
-    monkeypatch.chdir(project)
+    ``KANIBAKO_TEST_TMPFS`` names a tmpfs directory (``1`` means
+    ``/dev/shm``).  The suite creates many small files under ``tmp_path``;
+    keeping them in RAM avoids disk writes when ``/tmp`` is disk-backed.
+    A fresh directory is made for this run and passed to pytest as
+    ``--basetemp``, so concurrent runs never share it; it is removed again
+    in ``pytest_unconfigure``.  Skipped when ``--basetemp`` is already
+    given (as for xdist workers) or the directory has less than 1GiB free.
+    Runs before the tmpdir plugin reads ``--basetemp``.
+    """
+    root = os.environ.get("KANIBAKO_TEST_TMPFS")
+    if not root or config.option.basetemp:
+        return
+    if root == "1":
+        root = "/dev/shm"
+    try:
+        if shutil.disk_usage(root).free < _TMPFS_MIN_FREE:
+            return
+        basetemp = tempfile.mkdtemp(prefix="pytest-kanibako-", dir=root)
+    except OSError:
+        return
+    config.option.basetemp = basetemp
+    config.stash[_TMPFS_BASETEMP] = basetemp
+
+
+def pytest_unconfigure(config):
+    """Remove the tmpfs basetemp made by ``pytest_configure``, if any."""
+    basetemp = config.stash.get(_TMPFS_BASETEMP, None)
+    if basetemp is not None:
+        shutil.rmtree(basetemp, ignore_errors=True)
+
+
+def setup_tmp_home(root, mp):
+    """Build the ``tmp_home`` tree under *root* and point *mp* at it.
+
+    *mp* is a ``pytest.MonkeyPatch``; HOME, the XDG dirs and CWD are restored
+    when it is undone.  Lets wider-scoped fixtures reuse the same layout.
+    """
+    for d in ("home", "config", "data", "state", "cache", "project"):
+        (root / d).mkdir()
+    return use_tmp_home(root, mp)
 
-    return tmp_path
+
+def use_tmp_home(root, mp):
+    """Point HOME, the XDG dirs and CWD at an existing ``tmp_home`` *root*.
+
+    Lets a test re-enter a tree built earlier by ``setup_tmp_home`` (e.g. by
+    a class-scoped fixture) under its own function-scoped ``monkeypatch``.
+    """
+    mp.setenv("HOME", str(root / "home"))
+    mp.setenv("XDG_CONFIG_HOME", str(root / "config"))
+    mp.setenv("XDG_DATA_HOME", str(root / "data"))
+    mp.setenv("XDG_STATE_HOME", str(root / "state"))
+    mp.setenv("XDG_CACHE_HOME", str(root / "cache"))
+    mp.chdir(root / "project")
+    return root
+
+
+def write_default_config(tmp_home):
+    """Write a default kanibako.yaml under *tmp_home* and return its path."""
+    cf = tmp_home / "config" / "kanibako.yaml"
+    write_global_config(cf)
+    return cf
+
+
+@pytest.fixture
+def tmp_home(tmp_path, monkeypatch):
+    """Set HOME, XDG dirs, and CWD to an isolated temp tree."""
+    return setup_tmp_home(tmp_path, monkeypatch)
 
 
 @pytest.fixture
 def config_file(tmp_home):
     """Write a default kanibako.yaml and return its path."""
-    config_home = tmp_home / "config"
-    cf = config_home / "kanibako.yaml"
-    write_global_config(cf)
-    return cf
+    return write_default_config(tmp_home)
 
 
 @pytest.fixture
@@ -75,10 +128,11 @@ def project_dir(tmp_home):
     return tmp_home / "project"
 
 
-@pytest.fixture
-def credentials_dir(tmp_home, config_file):
-    """Set up host credentials and return the data path."""
-    from kanibako.config import load_config
+def write_host_credentials(tmp_home, config_file):
+    """Write host Claude credentials/settings under *tmp_home*.
+
+    Returns the data path, created if missing.
+    """
     from kanibako.paths import resolve_system_paths
     config = load_config(config_file)
     data_home = tmp_home / "data"
@@ -101,6 +155,12 @@ def credentials_dir(tmp_home, config_file):
     return data_path
 
 
+@pytest.fixture
+def credentials_dir(tmp_home, config_file):
+    """Set up host credentials and return the data path."""
+    return write_host_credentials(tmp_home, config_file)
+
+
 @pytest.fixture
 def fake_git_repo(tmp_home):
     """Create a real git repo (git init + commit) in tmp_home/project. Returns the project Path."""
@@ -12,6 +12,7 @@ import os
 import shutil
 import subprocess
 import sys
+from types import SimpleNamespace
 
 import pytest
 
@@ -84,47 +85,88 @@ def pulled_image(container_runtime_cmd: str) -> str:
     return LIGHTWEIGHT_IMAGE
 
 
+@pytest.fixture(scope="session")
+def integration_project(tmp_path_factory):
+    """One initialized project in its own HOME / XDG tree, built once.
+
+    The environment is only patched while the project is initialized, so
+    users must work with the returned paths directly.  The host and project
+    ``.claude/`` dirs already exist.  Tests sharing this tree must write only
+    files whose names are unique to the test and never remove siblings.
+
+    Returns a namespace with ``root`` (the tree) and ``proj``.
+    """
+    from kanibako.config import load_config
+    from kanibako.paths import load_std_paths, resolve_project
+
+    root = tmp_path_factory.mktemp("int_session")
+    with pytest.MonkeyPatch.context() as mp:
+        setup_integration_home(root, mp)
+        config = load_config(write_integration_config(root))
+        std = load_std_paths(config)
+        proj = resolve_project(std, config, initialize=True)
+
+    proj.metadata_path.mkdir(parents=True, exist_ok=True)
+    (proj.shell_path / ".claude").mkdir(parents=True, exist_ok=True)
+    (root / "int_home" / ".claude").mkdir(parents=True, exist_ok=True)
+    return SimpleNamespace(root=root, proj=proj)
+
+
 # ---------------------------------------------------------------------------
 # Per-test fixtures
 # ---------------------------------------------------------------------------
 
 
-@pytest.fixture
-def integration_home(tmp_path, monkeypatch):
-    """Isolated HOME / XDG tree for integration tests.
+def setup_integration_home(root, mp):
+    """Build an isolated HOME / XDG tree under *root* and point *mp* at it.
 
-    Identical in spirit to ``tmp_home`` but uses a distinct name so both
-    can coexist in the same session without confusion.
+    *mp* is a ``pytest.MonkeyPatch``; the env vars and cwd it sets are undone
+    with it.  Shared by the per-test ``integration_home`` fixture and by the
+    session-scoped ``integration_project`` fixture.
     """
-    home = tmp_path / "int_home"
+    home = root / "int_home"
     home.mkdir()
-    config_home = tmp_path / "int_config"
-    data_home = tmp_path / "int_data"
-    state_home = tmp_path / "int_state"
-    cache_home = tmp_path / "int_cache"
+    config_home = root / "int_config"
+    data_home = root / "int_data"
+    state_home = root / "int_state"
+    cache_home = root / "int_cache"
     for d in (config_home, data_home, state_home, cache_home):
         d.mkdir()
 
-    monkeypatch.setenv("HOME", str(home))
-    monkeypatch.setenv("XDG_CONFIG_HOME", str(config_home))
-    monkeypatch.setenv("XDG_DATA_HOME", str(data_home))
-    monkeypatch.setenv("XDG_STATE_HOME", str(state_home))
-    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    mp.setenv("HOME", str(home))
+    mp.setenv("XDG_CONFIG_HOME", str(config_home))
+    mp.setenv("XDG_DATA_HOME", str(data_home))
+    mp.setenv("XDG_STATE_HOME", str(state_home))
+    mp.setenv("XDG_CACHE_HOME", str(cache_home))
 
-    project = tmp_path / "project"
+    project = root / "project"
     project.mkdir()
-    monkeypatch.chdir(project)
+    mp.chdir(project)
 
-    return tmp_path
+    return root
+
+
+def write_integration_config(root):
+    """Write a default ``kanibako.yaml`` under *root* and return its path."""
+    cf = root / "int_config" / "kanibako.yaml"
+    write_global_config(cf)
+    return cf
+
+
+@pytest.fixture
+def integration_home(tmp_path, monkeypatch):
+    """Isolated HOME / XDG tree for integration tests.
+
+    Identical in spirit to ``tmp_home`` but uses a distinct name so both
+    can coexist in the same session without confusion.
+    """
+    return setup_integration_home(tmp_path, monkeypatch)
 
 
 @pytest.fixture
 def integration_config(integration_home):
     """Write a default ``kanibako.yaml`` and return its path."""
-    config_home = integration_home / "int_config"
-    cf = config_home / "kanibako.yaml"
-    write_global_config(cf)
-    return cf
+    return write_integration_config(integration_home)
 
 
 @pytest.fixture
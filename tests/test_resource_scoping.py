@@ -2,50 +2,101 @@
 
 from __future__ import annotations
 
+import json
+import os
+import shutil
+from collections.abc import Sequence
+from dataclasses import dataclass, field
 from types import SimpleNamespace
-from unittest.mock import MagicMock
 
+import pytest
+
+from kanibako.commands.start import (
+    _build_effective_state,
+    _build_resource_mounts,
+    _kanibako_mounts,
+)
+from kanibako.config import (
+    read_resource_overrides,
+    write_project_meta,
+    write_resource_override,
+)
 from kanibako.crabs import CrabConfig
 from kanibako.targets.base import ResourceMapping, ResourceScope, TargetSetting
 
 
+@dataclass(slots=True)
+class _StubTarget:
+    """Plain stand-in for a Target exposing only what start.py reads."""
+
+    mappings: list[ResourceMapping] = field(default_factory=list)
+    descriptors: Sequence[TargetSetting] = ()
+    config_dir_name: str = ".claude"
+    name: str = "claude"
+
+    def resource_mappings(self) -> list[ResourceMapping]:
+        return self.mappings
+
+    def setting_descriptors(self) -> Sequence[TargetSetting]:
+        return self.descriptors
+
+
+# Parses to the same data as write_project_meta(mode="default",
+# layout="default", workspace="/w", shell="/s", vault_ro="/ro",
+# vault_rw="/rw"); the quoting differs from its output.
+_PROJECT_META_YAML = (
+    'project:\n  mode: "default"\n  layout: "default"\n'
+    '  enable_vault: true\n  group_auth: true\n'
+    'resolved:\n  workspace: "/w"\n  shell: "/s"\n'
+    '  vault_ro: "/ro"\n  vault_rw: "/rw"\n'
+    '  metadata: ""\n  project_hash: ""\n'
+    '  global_shared: ""\n  local_shared: ""\n'
+)
+
+
+@pytest.fixture(scope="session")
+def proj_template(tmp_path_factory):
+    """Minimal ProjectPaths-like skeleton, built once per session.
+
+    Tests that only read it may use it in place; tests that write into it
+    must copy it first (see ``TestBuildResourceMounts._make_proj``).
+    """
+    root = tmp_path_factory.mktemp("proj")
+    _make_skeleton(str(root))
+    # Write an empty project.yaml so read_resource_overrides finds it.
+    (root / "metadata" / "project.yaml").write_text(_PROJECT_META_YAML)
+    return root
+
+
+def _make_skeleton(root):
+    """Create the metadata/shell/shared directories under the *root* string."""
+    os.makedirs(os.path.join(root, "metadata"))
+    os.makedirs(os.path.join(root, "shell", ".claude"))
+    os.makedirs(os.path.join(root, "shared", "global"))
+
+
+def _proj_at(root):
+    return SimpleNamespace(
+        metadata_path=root / "metadata",
+        shell_path=root / "shell",
+        global_shared_path=root / "shared" / "global",
+    )
+
+
 class TestBuildResourceMounts:
     """Tests for _build_resource_mounts() in start.py."""
 
-    def _make_proj(self, tmp_path):
-        """Create a minimal ProjectPaths-like object."""
-        metadata = tmp_path / "metadata"
-        metadata.mkdir()
-        shell = tmp_path / "shell"
-        shell.mkdir()
-        (shell / ".claude").mkdir()
-        global_shared = tmp_path / "shared" / "global"
-        global_shared.mkdir(parents=True)
-        # Write an empty project.yaml so read_resource_overrides finds it.
-        (metadata / "project.yaml").write_text(
-            'project:\n  mode: "default"\n  layout: "default"\n'
-            '  enable_vault: true\n  group_auth: true\n'
-            'resolved:\n  workspace: "/w"\n  shell: "/s"\n'
-            '  vault_ro: "/ro"\n  vault_rw: "/rw"\n'
-            '  metadata: ""\n  project_hash: ""\n'
-            '  global_shared: ""\n  local_shared: ""\n'
-        )
-        return SimpleNamespace(
-            metadata_path=metadata,
-            shell_path=shell,
-            global_shared_path=global_shared,
-        )
+    def _make_proj(self, tmp_path, template):
+        """Create a private copy of the project skeleton for a mutating test."""
+        root = tmp_path / "proj"
+        shutil.copytree(template, root)
+        return _proj_at(root)
 
     def _make_target(self, mappings):
-        target = MagicMock()
-        target.resource_mappings.return_value = mappings
-        target.config_dir_name = ".claude"
-        return target
-
-    def test_shared_resource_creates_mount(self, tmp_path):
-        from kanibako.commands.start import _build_resource_mounts
+        return _StubTarget(mappings=mappings)
 
-        proj = self._make_proj(tmp_path)
+    def test_shared_resource_creates_mount(self, tmp_path, proj_template):
+        proj = self._make_proj(tmp_path, proj_template)
         mappings = [ResourceMapping("plugins/", ResourceScope.SHARED, "Plugin binaries")]
         target = self._make_target(mappings)
 
@@ -54,25 +105,21 @@ class TestBuildResourceMounts:
         assert mounts[0].destination == "/home/agent/.claude/plugins/"
         assert "claude/plugins" in str(mounts[0].source)
 
-    def test_project_resource_no_mount(self, tmp_path):
-        from kanibako.commands.start import _build_resource_mounts
-
-        proj = self._make_proj(tmp_path)
+    def test_project_resource_no_mount(self, proj_template):
+        proj = _proj_at(proj_template)
         mappings = [ResourceMapping("projects/", ResourceScope.PROJECT, "Session data")]
         target = self._make_target(mappings)
 
         mounts = _build_resource_mounts(proj, target, "claude")
         assert len(mounts) == 0
 
-    def test_seeded_resource_copies_on_first_init(self, tmp_path):
-        from kanibako.commands.start import _build_resource_mounts
-
-        proj = self._make_proj(tmp_path)
+    def test_seeded_resource_copies_on_first_init(self, tmp_path, proj_template):
+        proj = self._make_proj(tmp_path, proj_template)
         # Create a seed file in the shared base.
         seed_dir = proj.global_shared_path / "claude"
         seed_file = seed_dir / "settings.json"
         seed_file.parent.mkdir(parents=True, exist_ok=True)
-        seed_file.write_text('{"key": "value"}')
+        seed_file.write_bytes(b'{"key": "value"}')
 
         mappings = [ResourceMapping("settings.json", ResourceScope.SEEDED, "Settings")]
         target = self._make_target(mappings)
@@ -85,19 +132,17 @@ class TestBuildResourceMounts:
         assert local.is_file()
         assert local.read_text() == '{"key": "value"}'
 
-    def test_seeded_resource_noop_when_local_exists(self, tmp_path):
-        from kanibako.commands.start import _build_resource_mounts
-
-        proj = self._make_proj(tmp_path)
+    def test_seeded_resource_noop_when_local_exists(self, tmp_path, proj_template):
+        proj = self._make_proj(tmp_path, proj_template)
         # Local already has the file.
         local = proj.shell_path / ".claude" / "settings.json"
-        local.write_text('{"local": true}')
+        local.write_bytes(b'{"local": true}')
 
         # Shared has a different version.
         seed_dir = proj.global_shared_path / "claude"
         seed_file = seed_dir / "settings.json"
         seed_file.parent.mkdir(parents=True, exist_ok=True)
-        seed_file.write_text('{"shared": true}')
+        seed_file.write_bytes(b'{"shared": true}')
 
         mappings = [ResourceMapping("settings.json", ResourceScope.SEEDED, "Settings")]
         target = self._make_target(mappings)
@@ -106,20 +151,16 @@ class TestBuildResourceMounts:
         # Local should NOT be overwritten.
         assert local.read_text() == '{"local": true}'
 
-    def test_no_mappings_returns_empty(self, tmp_path):
-        from kanibako.commands.start import _build_resource_mounts
-
-        proj = self._make_proj(tmp_path)
+    def test_no_mappings_returns_empty(self, proj_template):
+        proj = _proj_at(proj_template)
         target = self._make_target([])
 
         mounts = _build_resource_mounts(proj, target, "claude")
         assert mounts == []
 
-    def test_shared_file_resource_creates_file_not_dir(self, tmp_path):
+    def test_shared_file_resource_creates_file_not_dir(self, tmp_path, proj_template):
         """A SHARED resource without trailing slash is created as a file, not a directory."""
-        from kanibako.commands.start import _build_resource_mounts
-
-        proj = self._make_proj(tmp_path)
+        proj = self._make_proj(tmp_path, proj_template)
         mappings = [ResourceMapping("stats-cache.json", ResourceScope.SHARED, "Stats")]
         target = self._make_target(mappings)
 
@@ -129,10 +170,8 @@ class TestBuildResourceMounts:
         source = mounts[0].source
         assert source.is_file(), f"Expected file, got directory: {source}"
 
-    def test_no_shared_base_returns_empty(self, tmp_path):
-        from kanibako.commands.start import _build_resource_mounts
-
-        proj = self._make_proj(tmp_path)
+    def test_no_shared_base_returns_empty(self, proj_template):
+        proj = _proj_at(proj_template)
         proj.global_shared_path = None
         mappings = [ResourceMapping("plugins/", ResourceScope.SHARED, "Plugins")]
         target = self._make_target(mappings)
@@ -145,24 +184,11 @@ class TestResourceOverrideInMounts:
     """Test that resource overrides change mount behavior."""
 
     def _make_proj(self, tmp_path):
-        metadata = tmp_path / "metadata"
-        metadata.mkdir()
-        shell = tmp_path / "shell"
-        shell.mkdir()
-        (shell / ".claude").mkdir()
-        global_shared = tmp_path / "shared" / "global"
-        global_shared.mkdir(parents=True)
-        return SimpleNamespace(
-            metadata_path=metadata,
-            shell_path=shell,
-            global_shared_path=global_shared,
-        )
+        _make_skeleton(str(tmp_path))
+        return _proj_at(tmp_path)
 
     def test_override_shared_to_project(self, tmp_path):
         """Override a SHARED resource to PROJECT — no mount should be created."""
-        from kanibako.commands.start import _build_resource_mounts
-        from kanibako.config import write_project_meta, write_resource_override
-
         proj = self._make_proj(tmp_path)
         project_toml = proj.metadata_path / "project.yaml"
         write_project_meta(
@@ -173,18 +199,13 @@ class TestResourceOverrideInMounts:
         write_resource_override(project_toml, "plugins/", "project")
 
         mappings = [ResourceMapping("plugins/", ResourceScope.SHARED, "Plugins")]
-        target = MagicMock()
-        target.resource_mappings.return_value = mappings
-        target.config_dir_name = ".claude"
+        target = _StubTarget(mappings=mappings)
 
         mounts = _build_resource_mounts(proj, target, "claude")
         assert len(mounts) == 0
 
     def test_override_project_to_shared(self, tmp_path):
         """Override a PROJECT resource to SHARED — mount should be created."""
-        from kanibako.commands.start import _build_resource_mounts
-        from kanibako.config import write_project_meta, write_resource_override
-
         proj = self._make_proj(tmp_path)
         project_toml = proj.metadata_path / "project.yaml"
         write_project_meta(
@@ -195,9 +216,7 @@ class TestResourceOverrideInMounts:
         write_resource_override(project_toml, "projects/", "shared")
 
         mappings = [ResourceMapping("projects/", ResourceScope.PROJECT, "Session data")]
-        target = MagicMock()
-        target.resource_mappings.return_value = mappings
-        target.config_dir_name = ".claude"
+        target = _StubTarget(mappings=mappings)
 
         mounts = _build_resource_mounts(proj, target, "claude")
         assert len(mounts) == 1
@@ -206,17 +225,8 @@ class TestResourceOverrideInMounts:
     def test_invalid_path_rejected_by_cli(self, tmp_path):
         """Resource override with a path not in resource_mappings should be rejected by CLI."""
         # This tests the CLI validation in #12B — just verify read_resource_overrides works.
-        from kanibako.config import read_resource_overrides, write_resource_override
-
         project_toml = tmp_path / "project.yaml"
-        project_toml.write_text(
-            'project:\n  mode: "default"\n  layout: "default"\n'
-            '  enable_vault: true\n  group_auth: true\n'
-            'resolved:\n  workspace: "/w"\n  shell: "/s"\n'
-            '  vault_ro: "/ro"\n  vault_rw: "/rw"\n'
-            '  metadata: ""\n  project_hash: ""\n'
-            '  global_shared: ""\n  local_shared: ""\n'
-        )
+        project_toml.write_text(_PROJECT_META_YAML)
         write_resource_override(project_toml, "nonexistent/", "shared")
         overrides = read_resource_overrides(project_toml)
         assert overrides == {"nonexistent/": "shared"}
@@ -226,30 +236,22 @@ class TestKanibakoMounts:
     """Tests for _kanibako_mounts() in start.py."""
 
     def test_returns_two_mounts(self):
-        from kanibako.commands.start import _kanibako_mounts
-
         mounts = _kanibako_mounts()
         assert len(mounts) == 2
 
     def test_package_mount_destination(self):
-        from kanibako.commands.start import _kanibako_mounts
-
         mounts = _kanibako_mounts()
         pkg_mount = mounts[0]
         assert pkg_mount.destination == "/opt/kanibako/kanibako"
         assert pkg_mount.options == "ro"
 
     def test_entry_script_mount_destination(self):
-        from kanibako.commands.start import _kanibako_mounts
-
         mounts = _kanibako_mounts()
         entry_mount = mounts[1]
         assert entry_mount.destination == "/home/agent/.local/bin/kanibako"
         assert entry_mount.options == "ro"
 
     def test_package_source_is_kanibako_dir(self):
-        from kanibako.commands.start import _kanibako_mounts
-
         mounts = _kanibako_mounts()
         pkg_mount = mounts[0]
         # Source should be the kanibako package directory
@@ -257,8 +259,6 @@ class TestKanibakoMounts:
         assert (pkg_mount.source / "__init__.py").is_file()
 
     def test_entry_script_source_exists(self):
-        from kanibako.commands.start import _kanibako_mounts
-
         mounts = _kanibako_mounts()
         entry_mount = mounts[1]
         assert entry_mount.source.is_file()
@@ -266,63 +266,55 @@ class TestKanibakoMounts:
         assert "kanibako.cli" in content
 
 
+def _crab_yaml(settings):
+    """Render *settings* as a ``crab:`` section, written in one go.
+
+    Equivalent to calling write_crab_setting() per key, without re-reading
+    and re-dumping the file for every setting.
+    """
+    if not settings:
+        return ""
+    lines = ["crab:"]
+    lines.extend(f"  {k}: {json.dumps(v)}" for k, v in settings.items())
+    return "\n".join(lines) + "\n"
+
+
 class TestBuildEffectiveState:
     """Tests for _build_effective_state() precedence walk in start.py."""
 
+    _DESCRIPTORS_MODEL = (
+        TargetSetting(key="model", description="Model", default="opus"),
+    )
+    _DESCRIPTORS_MODEL_ACCESS = _DESCRIPTORS_MODEL + (
+        TargetSetting(key="access", description="Access", default="permissive"),
+    )
+
     def _make_target(self, descriptors):
-        target = MagicMock()
-        target.setting_descriptors.return_value = descriptors
-        target.name = "claude"
-        return target
+        return _StubTarget(descriptors=descriptors)
 
     def _make_global_config(self, tmp_path, settings=None):
         """Create a minimal global kanibako.yaml, optionally with [crab]."""
-        from kanibako.config import write_crab_setting
-
         global_toml = tmp_path / "kanibako.yaml"
-        global_toml.write_text("")
-        if settings:
-            for k, v in settings.items():
-                write_crab_setting(global_toml, k, v)
+        global_toml.write_text(_crab_yaml(settings))
         return global_toml
 
     def _make_workset_config(self, tmp_path, settings=None):
         """Create a minimal workset config.yaml, optionally with [crab]."""
-        from kanibako.config import write_crab_setting
-
         tmp_path.mkdir(parents=True, exist_ok=True)
         ws_toml = tmp_path / "config.yaml"
-        ws_toml.write_text("")
-        if settings:
-            for k, v in settings.items():
-                write_crab_setting(ws_toml, k, v)
+        ws_toml.write_text(_crab_yaml(settings))
         return ws_toml
 
     def _make_project_toml(self, tmp_path, settings=None):
         """Create a minimal project.yaml, optionally with [crab] overrides."""
-        from kanibako.config import write_project_meta, write_crab_setting
-
         tmp_path.mkdir(parents=True, exist_ok=True)
         project_toml = tmp_path / "project.yaml"
-        write_project_meta(
-            project_toml,
-            mode="default", layout="default",
-            workspace="/w", shell="/s", vault_ro="/ro", vault_rw="/rw",
-        )
-        if settings:
-            for k, v in settings.items():
-                write_crab_setting(project_toml, k, v)
+        project_toml.write_text(_PROJECT_META_YAML + _crab_yaml(settings))
         return project_toml
 
     def test_target_defaults_only(self, tmp_path):
         """When agent has no state and no project overrides, target defaults apply."""
-        from kanibako.commands.start import _build_effective_state
-
-        descriptors = [
-            TargetSetting(key="model", description="Model", default="opus"),
-            TargetSetting(key="access", description="Access", default="permissive"),
-        ]
-        target = self._make_target(descriptors)
+        target = self._make_target(self._DESCRIPTORS_MODEL_ACCESS)
         agent_cfg = CrabConfig()  # empty state
         project_toml = self._make_project_toml(tmp_path)
 
@@ -333,12 +325,7 @@ class TestBuildEffectiveState:
 
     def test_agent_overrides_default(self, tmp_path):
         """Agent config state overrides target defaults."""
-        from kanibako.commands.start import _build_effective_state
-
-        descriptors = [
-            TargetSetting(key="model", description="Model", default="opus"),
-        ]
-        target = self._make_target(descriptors)
+        target = self._make_target(self._DESCRIPTORS_MODEL)
         agent_cfg = CrabConfig(state={"model": "sonnet"})
         project_toml = self._make_project_toml(tmp_path)
 
@@ -349,12 +336,7 @@ class TestBuildEffectiveState:
 
     def test_project_override_wins(self, tmp_path):
         """Project overrides take highest precedence."""
-        from kanibako.commands.start import _build_effective_state
-
-        descriptors = [
-            TargetSetting(key="model", description="Model", default="opus"),
-        ]
-        target = self._make_target(descriptors)
+        target = self._make_target(self._DESCRIPTORS_MODEL)
         agent_cfg = CrabConfig(state={"model": "sonnet"})
         project_toml = self._make_project_toml(tmp_path, settings={"model": "haiku"})
 
@@ -365,12 +347,7 @@ class TestBuildEffectiveState:
 
     def test_agent_state_passthrough_for_undeclared_keys(self, tmp_path):
         """Undeclared keys from agent state are passed through."""
-        from kanibako.commands.start import _build_effective_state
-
-        descriptors = [
-            TargetSetting(key="model", description="Model", default="opus"),
-        ]
-        target = self._make_target(descriptors)
+        target = self._make_target(self._DESCRIPTORS_MODEL)
         agent_cfg = CrabConfig(state={"model": "sonnet", "custom_key": "custom_value"})
         project_toml = self._make_project_toml(tmp_path)
 
@@ -382,9 +359,7 @@ class TestBuildEffectiveState:
 
     def test_no_descriptors_returns_agent_state(self, tmp_path):
         """When target has no setting_descriptors, return agent state as-is."""
-        from kanibako.commands.start import _build_effective_state
-
-        target = self._make_target([])  # no descriptors
+        target = self._make_target(())  # no descriptors
         agent_cfg = CrabConfig(state={"model": "opus", "access": "permissive"})
         project_toml = self._make_project_toml(tmp_path)
 
@@ -396,12 +371,7 @@ class TestBuildEffectiveState:
     def test_system_level_provides_value(self, tmp_path):
         """System [crab] (global kanibako.yaml) supplies a value when nothing
         more specific sets it."""
-        from kanibako.commands.start import _build_effective_state
-
-        descriptors = [
-            TargetSetting(key="model", description="Model", default="opus"),
-        ]
-        target = self._make_target(descriptors)
+        target = self._make_target(self._DESCRIPTORS_MODEL)
         agent_cfg = CrabConfig()  # empty state
         project_toml = self._make_project_toml(tmp_path)
         global_toml = self._make_global_config(tmp_path, settings={"model": "sonnet"})
@@ -418,13 +388,7 @@ class TestBuildEffectiveState:
         Levels are most-specific-first ``[box, workset, crab, system]``, so a
         value set at the workset level beats one set in crab state.
         """
-        from kanibako.commands.start import _build_effective_state
-
-        descriptors = [
-            TargetSetting(key="model", description="Model", default="opus"),
-            TargetSetting(key="access", description="Access", default="permissive"),
-        ]
-        target = self._make_target(descriptors)
+        target = self._make_target(self._DESCRIPTORS_MODEL_ACCESS)
         global_toml = self._make_global_config(
             tmp_path, settings={"model": "sys-model", "access": "default"}
         )
@@ -468,12 +432,7 @@ class TestBuildEffectiveState:
 
     def test_empty_string_is_terminal(self, tmp_path):
         """An explicit '' at a level suppresses fall-through to the floor."""
-        from kanibako.commands.start import _build_effective_state
-
-        descriptors = [
-            TargetSetting(key="model", description="Model", default="opus"),
-        ]
-        target = self._make_target(descriptors)
+        target = self._make_target(self._DESCRIPTORS_MODEL)
         # crab state explicitly clears model.
         agent_cfg = CrabConfig(state={"model": ""})
         project_toml = self._make_project_toml(tmp_path)
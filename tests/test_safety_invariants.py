@@ -9,7 +9,7 @@ must include expected flags).
 
 from __future__ import annotations
 
-import hashlib
+import logging
 from pathlib import Path
 
 import pytest
@@ -30,6 +30,23 @@ from kanibako.targets.base import Mount
 from kanibako.plugins.claude import ClaudeTarget
 from kanibako.utils import short_hash
 
+# Project hashes used by the socket-path boundary checks.  Only their length
+# matters, so the sha256 digests are baked in rather than computed.
+# sha256 of /home/user/some/deep/project/path
+_HASH_DEEP = "b99f33787132456c7ec210c4b9f0467554a315577c6b469178abda61809f4c2d"
+_SHASH_DEEP = short_hash(_HASH_DEEP)
+# sha256 of /home/user/project
+_HASH_PROJECT = "9dad1e4e08b0b11cbcd860257e8bdfa6b8e5f01790e10a6a0b1f4870c13e686b"
+# sha256 of /very/deep/path
+_HASH_VERY_DEEP = "117ad2d55d5e864f170b367b5515dc5b1fe20841ab3fce6f4d5963a8770f52bb"
+_SHASH_VERY_DEEP = short_hash(_HASH_VERY_DEEP)
+# sha256 of /home/user/deep/project
+_HASH_DEEP_PROJECT = "3c7a5fa2ab8639483b54d987863e251f32bb29aee71e380c3741a91c5a898b26"
+_SHASH_DEEP_PROJECT = short_hash(_HASH_DEEP_PROJECT)
+
+
+_TEST_LOGGER = logging.getLogger("test_safety_invariants_mounts")
+
 
 # ── Fixtures ──────────────────────────────────────────────────────────
 
@@ -51,8 +68,14 @@ def config_file(tmp_path, monkeypatch):
 
 @pytest.fixture
 def tmp_home(tmp_path, monkeypatch):
-    monkeypatch.setenv("HOME", str(tmp_path))
-    return tmp_path
+    """$HOME as an already-resolved path.
+
+    Directories created beneath it need no further ``.resolve()`` before
+    being handed to ``detect_project_mode``.
+    """
+    home = tmp_path.resolve()
+    monkeypatch.setenv("HOME", str(home))
+    return home
 
 
 # ── Boundary tests: AF_UNIX socket path ──────────────────────────────
@@ -63,22 +86,19 @@ class TestSocketPathBoundary:
     def test_short_hash_socket_under_limit(self):
         """Socket in /run/user/$UID/kanibako/ with short_hash stays under limit."""
         # Simulate a realistic path.
-        long_hash = hashlib.sha256(b"/home/user/some/deep/project/path").hexdigest()
-        shash = short_hash(long_hash)
-        socket_path = Path(f"/run/user/1000/kanibako/{shash}.sock")
-        assert len(str(socket_path)) < _UNIX_SOCKET_PATH_LIMIT
+        socket_str = f"/run/user/1000/kanibako/{_SHASH_DEEP}.sock"
+        assert len(socket_str) < _UNIX_SOCKET_PATH_LIMIT
 
     def test_name_based_socket_under_limit(self):
         """Socket with project name stays under limit for typical names."""
-        socket_path = Path("/run/user/1000/kanibako/my-long-project-name.sock")
-        assert len(str(socket_path)) < _UNIX_SOCKET_PATH_LIMIT
+        socket_str = "/run/user/1000/kanibako/my-long-project-name.sock"
+        assert len(socket_str) < _UNIX_SOCKET_PATH_LIMIT
 
     def test_metadata_path_socket_exceeds_limit(self):
         """Socket in metadata_path (old location) would exceed the limit."""
-        long_hash = hashlib.sha256(b"/home/user/project").hexdigest()
         # This is the OLD location that caused the bug.
-        socket_path = Path(f"/home/user/.local/share/kanibako/boxes/{long_hash}/helper.sock")
-        assert len(str(socket_path)) >= _UNIX_SOCKET_PATH_LIMIT
+        socket_str = f"/home/user/.local/share/kanibako/boxes/{_HASH_PROJECT}/helper.sock"
+        assert len(socket_str) >= _UNIX_SOCKET_PATH_LIMIT
 
     def test_validate_socket_path_raises_on_long_path(self):
         """validate_socket_path raises ValueError for paths at the limit."""
@@ -95,18 +115,14 @@ class TestSocketPathBoundary:
     def test_worst_case_xdg_runtime_dir(self):
         """Even with a long XDG_RUNTIME_DIR, socket stays under limit."""
         # Some systems have longer runtime dirs.
-        long_hash = hashlib.sha256(b"/very/deep/path").hexdigest()
-        shash = short_hash(long_hash)
         # Simulate a long-ish runtime dir.
-        socket_path = Path(f"/run/user/1000000/kanibako/{shash}.sock")
-        assert len(str(socket_path)) < _UNIX_SOCKET_PATH_LIMIT
+        socket_str = f"/run/user/1000000/kanibako/{_SHASH_VERY_DEEP}.sock"
+        assert len(socket_str) < _UNIX_SOCKET_PATH_LIMIT
 
     def test_tmp_fallback_under_limit(self):
         """Fallback /tmp/kanibako-$UID/ path stays under limit."""
-        long_hash = hashlib.sha256(b"/home/user/deep/project").hexdigest()
-        shash = short_hash(long_hash)
-        socket_path = Path(f"/tmp/kanibako-1000000/{shash}.sock")
-        assert len(str(socket_path)) < _UNIX_SOCKET_PATH_LIMIT
+        socket_str = f"/tmp/kanibako-1000000/{_SHASH_DEEP_PROJECT}.sock"
+        assert len(socket_str) < _UNIX_SOCKET_PATH_LIMIT
 
 
 # ── Negative tests: detection false positives ─────────────────────────
@@ -123,22 +139,22 @@ class TestDetectionFalsePositives:
         ".git",
     ]
 
-    @pytest.mark.parametrize("dirname", COMMON_NAMES)
-    def test_subdirectory_name_does_not_trigger_standalone(
-        self, config_file, tmp_home, dirname,
+    def test_subdirectory_names_do_not_trigger_standalone(
+        self, config_file, tmp_home,
     ):
-        """A subdirectory named '{dirname}' should not trigger standalone mode."""
+        """No subdirectory in COMMON_NAMES should trigger standalone mode."""
         config = load_config(config_file)
         std = load_std_paths(config)
-        project_dir = tmp_home / "myproject"
-        project_dir.mkdir()
-        (project_dir / dirname).mkdir()
+        for dirname in self.COMMON_NAMES:
+            project_dir = tmp_home / f"myproject_{dirname}"
+            project_dir.mkdir()
+            (project_dir / dirname).mkdir()
 
-        result = detect_project_mode(project_dir.resolve(), std, config)
-        # Should fall through to local (default), NOT standalone.  A bare
-        # directory (even ``.kanibako``) is not a marker on its own: a real
-        # standalone project.yaml is required.
-        assert result.mode is not ProjectMode.standalone
+            result = detect_project_mode(project_dir, std, config)
+            # Should fall through to local (default), NOT standalone.  A bare
+            # directory (even ``.kanibako``) is not a marker on its own: a real
+            # standalone project.yaml is required.
+            assert result.mode is not ProjectMode.standalone, dirname
 
     def test_ancestor_named_kanibako_no_false_positive(
         self, config_file, tmp_home,
@@ -152,7 +168,7 @@ class TestDetectionFalsePositives:
         src_dir = kanibako_dir / "src"
         src_dir.mkdir(parents=True)
 
-        result = detect_project_mode(src_dir.resolve(), std, config)
+        result = detect_project_mode(src_dir, std, config)
         assert result.mode is not ProjectMode.standalone
 
     def test_dotless_kanibako_with_toml_is_valid(
@@ -168,7 +184,7 @@ class TestDetectionFalsePositives:
             'project:\n  mode: "standalone"\n'
         )
 
-        result = detect_project_mode(project_dir.resolve(), std, config)
+        result = detect_project_mode(project_dir, std, config)
         assert result.mode is ProjectMode.standalone
 
     def test_dot_kanibako_marker_with_toml_is_valid(
@@ -184,7 +200,7 @@ class TestDetectionFalsePositives:
             'project:\n  mode: "standalone"\n'
         )
 
-        result = detect_project_mode(project_dir.resolve(), std, config)
+        result = detect_project_mode(project_dir, std, config)
         assert result.mode is ProjectMode.standalone
 
     def test_dot_kanibako_marker_without_toml_is_not_standalone(
@@ -197,7 +213,7 @@ class TestDetectionFalsePositives:
         project_dir.mkdir()
         (project_dir / ".kanibako").mkdir()
 
-        result = detect_project_mode(project_dir.resolve(), std, config)
+        result = detect_project_mode(project_dir, std, config)
         assert result.mode is not ProjectMode.standalone
 
 
@@ -214,16 +230,16 @@ class TestStaleNameSafety:
 
         # Register a stale entry pointing at $HOME.
         from kanibako.names import register_name
-        register_name(std.data_path, "jjb", str(home.resolve()))
+        register_name(std.data_path, "jjb", str(home))
         # Intentionally do NOT create boxes/jjb/
 
         # Run detection from a subdirectory of $HOME.
         project_dir = home / "myproject"
         project_dir.mkdir(parents=True, exist_ok=True)
-        result = detect_project_mode(project_dir.resolve(), std, config)
+        result = detect_project_mode(project_dir, std, config)
 
         # Should fall through to the default mode at project_dir, NOT match $HOME.
-        assert result.project_root == project_dir.resolve()
+        assert result.project_root == project_dir
         assert result.mode is ProjectMode.default
 
 
@@ -232,26 +248,29 @@ class TestStaleNameSafety:
 class TestMountValidation:
     """All mount sources must exist before being passed to the container runtime."""
 
-    def test_validate_mounts_warns_on_missing_source(self, tmp_path, capsys):
-        """_validate_mounts prints a warning for non-existent source."""
-        import logging
-        logger = logging.getLogger("test")
+    def test_validate_mounts_warns_on_missing_source(self, tmp_path, caplog, capsys):
+        """_validate_mounts warns on stderr and in the log for non-existent source."""
+        logger = _TEST_LOGGER
+        caplog.set_level(logging.WARNING, logger=_TEST_LOGGER.name)
 
+        missing = tmp_path / "nonexistent" / "file"
         mounts = [
             Mount(
-                source=tmp_path / "nonexistent" / "file",
+                source=missing,
                 destination="/home/agent/.local/bin/claude",
                 options="ro",
             ),
         ]
         _validate_mounts(mounts, logger)
-        captured = capsys.readouterr()
-        assert "mount source does not exist" in captured.err
+        assert f"Warning: mount source does not exist: {missing}" in capsys.readouterr().err
+        [record] = caplog.records
+        assert record.levelno == logging.WARNING
+        assert record.msg == "Mount source missing: %s → %s"
+        assert record.args == (missing, "/home/agent/.local/bin/claude")
 
     def test_validate_mounts_silent_on_existing_source(self, tmp_path, capsys):
         """_validate_mounts is silent when all sources exist."""
-        import logging
-        logger = logging.getLogger("test")
+        logger = _TEST_LOGGER
 
         existing = tmp_path / "real_file"
         existing.touch()
@@ -264,8 +283,7 @@ class TestMountValidation:
 
     def test_validate_mounts_handles_empty_list(self):
         """_validate_mounts handles empty mount list without error."""
-        import logging
-        logger = logging.getLogger("test")
+        logger = _TEST_LOGGER
         _validate_mounts([], logger)  # Should not raise.
 
 
@@ -442,79 +460,40 @@ class TestSyncBinarySymlink:
 
 # ── Contract tests: CLI args invariants ───────────────────────────────
 
-class TestCLIArgsContract:
-    """CLI args must include expected flags for common scenarios."""
-
-    def test_existing_project_gets_continue(self):
-        """An existing (non-new) project must get --continue."""
-        t = ClaudeTarget()
-        args = t.build_cli_args(
-            safe_mode=False,
-            resume_mode=False,
-            new_session=False,
-            is_new_project=False,
-            extra_args=[],
-        )
-        assert "--continue" in args
-
-    def test_new_project_skips_continue(self):
-        """A new project must NOT get --continue."""
-        t = ClaudeTarget()
-        args = t.build_cli_args(
-            safe_mode=False,
-            resume_mode=False,
-            new_session=False,
-            is_new_project=True,
-            extra_args=[],
-        )
-        assert "--continue" not in args
-
-    def test_default_includes_dangerous_skip(self):
-        """Default (non-safe) mode must include --dangerously-skip-permissions."""
-        t = ClaudeTarget()
-        args = t.build_cli_args(
-            safe_mode=False,
-            resume_mode=False,
-            new_session=False,
-            is_new_project=False,
-            extra_args=[],
-        )
-        assert "--dangerously-skip-permissions" in args
+_CLAUDE = ClaudeTarget()
 
-    def test_safe_mode_excludes_dangerous_skip(self):
-        """Safe mode must NOT include --dangerously-skip-permissions."""
-        t = ClaudeTarget()
-        args = t.build_cli_args(
-            safe_mode=True,
-            resume_mode=False,
-            new_session=False,
-            is_new_project=False,
-            extra_args=[],
-        )
-        assert "--dangerously-skip-permissions" not in args
 
-    def test_resume_mode_includes_resume_flag(self):
-        """Resume mode must include --resume."""
-        t = ClaudeTarget()
-        args = t.build_cli_args(
-            safe_mode=False,
-            resume_mode=True,
-            new_session=False,
-            is_new_project=False,
-            extra_args=[],
-        )
-        assert "--resume" in args
-        assert "--continue" not in args
+class TestCLIArgsContract:
+    """CLI args must include expected flags for common scenarios."""
 
-    def test_extra_args_with_resume_skips_continue(self):
-        """Passing --resume in extra_args must skip --continue."""
-        t = ClaudeTarget()
-        args = t.build_cli_args(
-            safe_mode=False,
-            resume_mode=False,
-            new_session=False,
-            is_new_project=False,
-            extra_args=["--resume"],
-        )
-        assert "--continue" not in args
-        assert "--resume" in args
+    @pytest.mark.parametrize(
+        "overrides,expect_in,expect_out",
+        [
+            # An existing (non-new) project in default (non-safe) mode gets
+            # --continue and --dangerously-skip-permissions.
+            ({}, ["--continue", "--dangerously-skip-permissions"], []),
+            # A new project must NOT get --continue.
+            ({"is_new_project": True}, [], ["--continue"]),
+            # Safe mode must NOT include --dangerously-skip-permissions.
+            ({"safe_mode": True}, [], ["--dangerously-skip-permissions"]),
+            # Resume mode includes --resume instead of --continue.
+            ({"resume_mode": True}, ["--resume"], ["--continue"]),
+            # Passing --resume in extra_args must skip --continue.
+            ({"extra_args": ["--resume"]}, ["--resume"], ["--continue"]),
+        ],
+        ids=["existing", "new-project", "safe-mode", "resume-mode", "extra-resume"],
+    )
+    def test_flags(self, overrides, expect_in, expect_out):
+        kwargs = {
+            "safe_mode": False,
+            "resume_mode": False,
+            "new_session": False,
+            "is_new_project": False,
+            "extra_args": [],
+            **overrides,
+        }
+        args = _CLAUDE.build_cli_args(**kwargs)
+        for flag in expect_in:
+            assert flag in args
+        for flag in expect_out:
+            assert flag not in args
@@ -12,7 +12,6 @@ import fcntl
 import json
 import os
 import subprocess
-import threading
 import time
 
 import pytest
@@ -20,22 +19,22 @@ import pytest
 from tests.conftest_integration import requires_runtime
 
 
+@pytest.fixture
+def lock_file(request, integration_project):
+    """A per-test lock file in the session's shared initialized project.
+
+    Named after the test, so a lock leaked by a failing test cannot make
+    later tests fail, and ``resolve_project(initialize=True)`` runs only once.
+    """
+    return integration_project.proj.metadata_path / f".kanibako-{request.node.name}.lock"
+
+
 @pytest.mark.integration
 class TestRealFcntlLocking:
     """fcntl-based lock acquisition with real file descriptors."""
 
-    def test_lock_acquired_and_released(self, integration_home, integration_config):
+    def test_lock_acquired_and_released(self, lock_file):
         """Lock file is unlocked after the pipeline returns."""
-        from kanibako.config import load_config
-        from kanibako.paths import load_std_paths, resolve_project
-
-        config = load_config(integration_config)
-        std = load_std_paths(config)
-        proj = resolve_project(std, config, initialize=True)
-
-        lock_file = proj.metadata_path / ".kanibako.lock"
-        lock_file.parent.mkdir(parents=True, exist_ok=True)
-
         # Acquire lock
         fd = open(lock_file, "w")
         fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
@@ -52,57 +51,21 @@ class TestRealFcntlLocking:
         fcntl.flock(fd2, fcntl.LOCK_UN)
         fd2.close()
 
-    def test_concurrent_lock_contention(self, integration_home, integration_config):
+    def test_concurrent_lock_contention(self, lock_file):
         """A second caller gets OSError when the lock is already held."""
-        from kanibako.config import load_config
-        from kanibako.paths import load_std_paths, resolve_project
-
-        config = load_config(integration_config)
-        std = load_std_paths(config)
-        proj = resolve_project(std, config, initialize=True)
-
-        lock_file = proj.metadata_path / ".kanibako.lock"
-        lock_file.parent.mkdir(parents=True, exist_ok=True)
-
-        fd1 = open(lock_file, "w")
-        fcntl.flock(fd1, fcntl.LOCK_EX | fcntl.LOCK_NB)
-
-        blocked = threading.Event()
-
-        def try_lock():
-            fd2 = open(lock_file, "w")
+        with open(lock_file, "w") as fd1:
+            fcntl.flock(fd1, fcntl.LOCK_EX | fcntl.LOCK_NB)
             try:
-                fcntl.flock(fd2, fcntl.LOCK_EX | fcntl.LOCK_NB)
-                # Should not reach here
-                fcntl.flock(fd2, fcntl.LOCK_UN)
-                fd2.close()
-            except OSError:
-                blocked.set()
-                fd2.close()
-
-        t = threading.Thread(target=try_lock)
-        t.start()
-        t.join(timeout=5)
-
-        assert blocked.is_set(), "Second lock attempt should have raised OSError"
-
-        fcntl.flock(fd1, fcntl.LOCK_UN)
-        fd1.close()
-
-    def test_lock_released_after_container_error(
-        self, integration_home, integration_config
-    ):
+                # flock() locks belong to the open file description, so a
+                # second open() of the same file contends even within this
+                # process.
+                with open(lock_file, "w") as fd2, pytest.raises(OSError):
+                    fcntl.flock(fd2, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            finally:
+                fcntl.flock(fd1, fcntl.LOCK_UN)
+
+    def test_lock_released_after_container_error(self, lock_file):
         """Lock is released in the finally block even after a container error."""
-        from kanibako.config import load_config
-        from kanibako.paths import load_std_paths, resolve_project
-
-        config = load_config(integration_config)
-        std = load_std_paths(config)
-        proj = resolve_project(std, config, initialize=True)
-
-        lock_file = proj.metadata_path / ".kanibako.lock"
-        lock_file.parent.mkdir(parents=True, exist_ok=True)
-
         fd = open(lock_file, "w")
         try:
             fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
@@ -120,30 +83,31 @@ class TestRealFcntlLocking:
         fd2.close()
 
 
+def _setup_cred_flow(shared, name, host_token):
+    """Write *host_token* as host credentials in the shared project tree.
+
+    Files are named after *name* so tests sharing the tree never collide.
+    Returns ``(host_creds, project_creds)``; the latter is not created.
+    """
+    host_creds = shared.root / "int_home" / ".claude" / f"{name}.credentials.json"
+    host_creds.write_text(json.dumps(host_token))
+
+    project_creds = shared.proj.shell_path / ".claude" / f"{name}.credentials.json"
+    return host_creds, project_creds
+
+
 @pytest.mark.integration
 class TestCredentialFlow:
     """End-to-end credential refresh pipeline with real files."""
 
-    def test_host_to_project_flow(
-        self, integration_home, integration_config, integration_credentials
-    ):
+    def test_host_to_project_flow(self, integration_project):
         """Full credential pipeline: host → project, real files."""
-        from kanibako.config import load_config
         from kanibako.plugins.claude.credentials import refresh_host_to_project
-        from kanibako.paths import load_std_paths, resolve_project
-
-        config = load_config(integration_config)
-        std = load_std_paths(config)
-        proj = resolve_project(std, config, initialize=True)
 
-        # Create fake host credentials
-        host_claude = integration_home / "int_home" / ".claude"
-        host_claude.mkdir(parents=True, exist_ok=True)
-        host_creds = host_claude / ".credentials.json"
-        host_token = {"claudeAiOauth": {"token": "host-fresh-token"}, "extra": True}
-        host_creds.write_text(json.dumps(host_token))
-
-        project_creds = proj.shell_path / ".claude" / ".credentials.json"
+        host_creds, project_creds = _setup_cred_flow(
+            integration_project, "host_to_project",
+            {"claudeAiOauth": {"token": "host-fresh-token"}, "extra": True},
+        )
 
         # Refresh host → project
         refresh_host_to_project(host_creds, project_creds)
@@ -151,27 +115,16 @@ class TestCredentialFlow:
         project_data = json.loads(project_creds.read_text())
         assert project_data["claudeAiOauth"]["token"] == "host-fresh-token"
 
-    def test_mtime_based_freshness(
-        self, integration_home, integration_config, integration_credentials
-    ):
+    def test_mtime_based_freshness(self, integration_project):
         """A newer project credential is not overwritten by an older host one."""
-        from kanibako.config import load_config
         from kanibako.plugins.claude.credentials import refresh_host_to_project
-        from kanibako.paths import load_std_paths, resolve_project
-
-        config = load_config(integration_config)
-        std = load_std_paths(config)
-        proj = resolve_project(std, config, initialize=True)
 
-        # Create host credentials
-        host_claude = integration_home / "int_home" / ".claude"
-        host_claude.mkdir(parents=True, exist_ok=True)
-        host_creds = host_claude / ".credentials.json"
-        host_creds.write_text(json.dumps({"claudeAiOauth": {"token": "host-old"}}))
+        host_creds, project_creds = _setup_cred_flow(
+            integration_project, "mtime_freshness",
+            {"claudeAiOauth": {"token": "host-old"}},
+        )
 
         # Write project credentials with fresh token
-        project_creds = proj.shell_path / ".claude" / ".credentials.json"
-        project_creds.parent.mkdir(parents=True, exist_ok=True)
         project_creds.write_text(json.dumps({"claudeAiOauth": {"token": "project-fresh"}}))
 
         # Set project mtime ahead of host
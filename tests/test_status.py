@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import argparse
+import os
 import time
 from pathlib import Path
 from types import SimpleNamespace
@@ -19,15 +20,19 @@ from kanibako.commands.box._parser import (
 from kanibako.config import load_config
 from kanibako.errors import ContainerError
 from kanibako.paths import load_std_paths, resolve_project
+from tests.conftest import (
+    setup_tmp_home,
+    use_tmp_home,
+    write_default_config,
+    write_host_credentials,
+)
 
 
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
 
-@pytest.fixture
-def initialized_project(config_file, credentials_dir, tmp_home):
-    """Create a fully initialized default-mode project."""
+def _init_project(config_file, tmp_home):
     config = load_config(config_file)
     std = load_std_paths(config)
     project_dir = str(tmp_home / "project")
@@ -38,6 +43,44 @@ def initialized_project(config_file, credentials_dir, tmp_home):
     )
 
 
+@pytest.fixture
+def initialized_project(config_file, credentials_dir, tmp_home):
+    """Create a fully initialized default-mode project."""
+    return _init_project(config_file, tmp_home)
+
+
+@pytest.fixture(scope="class")
+def _shared_project_tree(tmp_path_factory):
+    """Build the ``shared_project`` tree once per class.
+
+    The env patches are only active while it is built; each test re-enters
+    the tree through ``shared_project``.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        tmp_home = setup_tmp_home(tmp_path_factory.mktemp("info"), mp)
+        config_file = write_default_config(tmp_home)
+        write_host_credentials(tmp_home, config_file)
+        project = _init_project(config_file, tmp_home)
+    return project
+
+
+@pytest.fixture
+def shared_project(_shared_project_tree, monkeypatch):
+    """An ``initialized_project`` built once and shared by a test class.
+
+    Only for tests that leave the project untouched; tests that write into
+    it use the per-test ``initialized_project`` instead.
+    """
+    use_tmp_home(_shared_project_tree.tmp_home, monkeypatch)
+    return _shared_project_tree
+
+
+@pytest.fixture(scope="module")
+def parser():
+    """One CLI parser for the module; parse_args() does not mutate it."""
+    return build_parser()
+
+
 # ---------------------------------------------------------------------------
 # Parser tests
 # ---------------------------------------------------------------------------
@@ -47,28 +90,24 @@ class TestBoxInfoParser:
         """Top-level 'status' command has been removed."""
         assert "status" not in _SUBCOMMANDS
 
-    def test_box_info_parser_default(self):
-        parser = build_parser()
+    def test_box_info_parser_default(self, parser):
         args = parser.parse_args(["box", "info"])
         assert args.command == "box"
         assert args.box_command == "info"
         assert args.path is None
 
-    def test_box_info_parser_with_path(self):
-        parser = build_parser()
+    def test_box_info_parser_with_path(self, parser):
         args = parser.parse_args(["box", "info", "/tmp/mydir"])
         assert args.command == "box"
         assert args.path == "/tmp/mydir"
 
-    def test_box_inspect_alias(self):
-        parser = build_parser()
+    def test_box_inspect_alias(self, parser):
         args = parser.parse_args(["box", "inspect"])
         assert args.command == "box"
         assert hasattr(args, "func")
         assert args.func is run_info
 
-    def test_box_info_has_func(self):
-        parser = build_parser()
+    def test_box_info_has_func(self, parser):
         args = parser.parse_args(["box", "info"])
         assert hasattr(args, "func")
         assert args.func is run_info
@@ -92,33 +131,18 @@ class TestFormatCredentialAge:
         assert "ago" in result
         assert "UTC" in result
 
-    def test_old_file(self, tmp_path):
-        creds = tmp_path / "creds.json"
-        creds.write_text("{}")
-        # Set mtime to 2 days ago.
-        old_time = time.time() - 2 * 86400
-        import os
-        os.utime(creds, (old_time, old_time))
-        result = _format_credential_age(creds)
-        assert "2d ago" in result
-
-    def test_hours_ago(self, tmp_path):
-        creds = tmp_path / "creds.json"
-        creds.write_text("{}")
-        old_time = time.time() - 3 * 3600
-        import os
-        os.utime(creds, (old_time, old_time))
-        result = _format_credential_age(creds)
-        assert "3h ago" in result
-
-    def test_minutes_ago(self, tmp_path):
+    @pytest.mark.parametrize(
+        ("delta", "needle"),
+        [(2 * 86400, "2d ago"), (3 * 3600, "3h ago"), (5 * 60, "5m ago")],
+        ids=["days", "hours", "minutes"],
+    )
+    def test_age(self, tmp_path, delta, needle):
         creds = tmp_path / "creds.json"
         creds.write_text("{}")
-        old_time = time.time() - 5 * 60
-        import os
+        old_time = time.time() - delta
         os.utime(creds, (old_time, old_time))
         result = _format_credential_age(creds)
-        assert "5m ago" in result
+        assert needle in result
 
 
 # ---------------------------------------------------------------------------
@@ -226,26 +250,26 @@ class TestCheckContainerRunning:
 # ---------------------------------------------------------------------------
 
 class TestRunInfo:
-    def test_no_project_data(self, config_file, tmp_home, capsys):
-        """Info for a directory with no kanibako data."""
-        args = argparse.Namespace(path=None)
+    @pytest.fixture(autouse=True)
+    def mock_container_check(self):
         with patch(
             "kanibako.commands.box._parser._check_container_running",
             return_value=(False, "not running (kanibako-abcdef12)"),
-        ):
-            rc = run_info(args)
+        ) as m:
+            yield m
+
+    def test_no_project_data(self, config_file, tmp_home, capsys):
+        """Info for a directory with no kanibako data."""
+        args = argparse.Namespace(path=None)
+        rc = run_info(args)
         assert rc == 1
         out = capsys.readouterr().out
         assert "No project data found" in out
 
-    def test_initialized_project(self, initialized_project, capsys):
+    def test_initialized_project(self, shared_project, capsys):
         """Info for an initialized default-mode project."""
-        args = argparse.Namespace(path=initialized_project.project_dir)
-        with patch(
-            "kanibako.commands.box._parser._check_container_running",
-            return_value=(False, "not running (kanibako-abcdef12)"),
-        ):
-            rc = run_info(args)
+        args = argparse.Namespace(path=shared_project.project_dir)
+        rc = run_info(args)
         assert rc == 0
         out = capsys.readouterr().out
         assert "Name:" in out
@@ -259,28 +283,21 @@ class TestRunInfo:
         assert "Image:" in out
         assert "Credentials:" in out
 
-    def test_lock_active(self, initialized_project, capsys):
+    def test_lock_active(self, initialized_project, mock_container_check, capsys):
         """Info shows ACTIVE lock when lock file exists."""
+        mock_container_check.return_value = (False, "not running (kanibako-test)")
         lock_file = initialized_project.proj.metadata_path / ".kanibako.lock"
         lock_file.write_text("kanibako-test\n")
         args = argparse.Namespace(path=initialized_project.project_dir)
-        with patch(
-            "kanibako.commands.box._parser._check_container_running",
-            return_value=(False, "not running (kanibako-test)"),
-        ):
-            rc = run_info(args)
+        rc = run_info(args)
         assert rc == 0
         out = capsys.readouterr().out
         assert "ACTIVE" in out
 
-    def test_with_path_arg(self, initialized_project, capsys):
+    def test_with_path_arg(self, shared_project, capsys):
         """Info with path argument pointing to a project directory."""
-        args = argparse.Namespace(path=initialized_project.project_dir)
-        with patch(
-            "kanibako.commands.box._parser._check_container_running",
-            return_value=(False, "not running (kanibako-abcdef12)"),
-        ):
-            rc = run_info(args)
+        args = argparse.Namespace(path=shared_project.project_dir)
+        rc = run_info(args)
         assert rc == 0
 
     def test_nonexistent_directory(self, config_file, tmp_home, capsys):
@@ -291,14 +308,10 @@ class TestRunInfo:
         err = capsys.readouterr().err
         assert "does not exist" in err
 
-    def test_shows_image(self, initialized_project, capsys):
+    def test_shows_image(self, shared_project, capsys):
         """Info shows the configured container image."""
-        args = argparse.Namespace(path=initialized_project.project_dir)
-        with patch(
-            "kanibako.commands.box._parser._check_container_running",
-            return_value=(False, "not running (kanibako-abcdef12)"),
-        ):
-            rc = run_info(args)
+        args = argparse.Namespace(path=shared_project.project_dir)
+        rc = run_info(args)
         assert rc == 0
         out = capsys.readouterr().out
         # Default image from KanibakoConfig
@@ -309,11 +322,7 @@ class TestRunInfo:
         project_toml = initialized_project.proj.metadata_path / "project.yaml"
         project_toml.write_text('box:\n  image: "custom:v2"\n')
         args = argparse.Namespace(path=initialized_project.project_dir)
-        with patch(
-            "kanibako.commands.box._parser._check_container_running",
-            return_value=(False, "not running (kanibako-abcdef12)"),
-        ):
-            rc = run_info(args)
+        rc = run_info(args)
         assert rc == 0
         out = capsys.readouterr().out
         assert "custom:v2" in out
@@ -330,9 +339,6 @@ class TestRunInfo:
         mock_target.credential_check_path.return_value = creds
         args = argparse.Namespace(path=initialized_project.project_dir)
         with patch(
-            "kanibako.commands.box._parser._check_container_running",
-            return_value=(False, "not running (kanibako-abcdef12)"),
-        ), patch(
             "kanibako.commands.box._parser.resolve_target",
             return_value=mock_target,
         ):
@@ -342,17 +348,14 @@ class TestRunInfo:
         # Should show "ago" for a recently-created file.
         assert "ago" in out
 
-    def test_no_credentials_shows_na(self, initialized_project, capsys):
+    def test_no_credentials_shows_na(self, shared_project, capsys):
         """Info shows n/a when no credentials file exists."""
-        creds = initialized_project.proj.shell_path / ".claude" / ".credentials.json"
+        creds = shared_project.proj.shell_path / ".claude" / ".credentials.json"
         # Mock target so credential_check_path returns a path that doesn't exist.
         mock_target = MagicMock()
         mock_target.credential_check_path.return_value = creds
-        args = argparse.Namespace(path=initialized_project.project_dir)
+        args = argparse.Namespace(path=shared_project.project_dir)
         with patch(
-            "kanibako.commands.box._parser._check_container_running",
-            return_value=(False, "not running (kanibako-abcdef12)"),
-        ), patch(
             "kanibako.commands.box._parser.resolve_target",
             return_value=mock_target,
         ):
@@ -3,37 +3,93 @@
 from __future__ import annotations
 
 import json
-from pathlib import Path
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
 from unittest.mock import MagicMock, patch
 
+import pytest
 
 from kanibako.targets.base import AgentInstall, ResourceMapping, ResourceScope, TargetSetting
 from kanibako.plugins.claude import ClaudeTarget
 
+_WHICH = "kanibako.plugins.claude.target.shutil.which"
+_SUBPROC = "kanibako.plugins.claude.target.subprocess.run"
+
+
+def _symlinks_supported() -> bool:
+    """Return True if this platform lets an unprivileged user create symlinks."""
+    try:
+        with tempfile.TemporaryDirectory() as d:
+            os.symlink(d, os.path.join(d, "link"))
+    except (OSError, NotImplementedError):
+        return False
+    return True
+
+
+requires_symlinks = pytest.mark.skipif(
+    not _symlinks_supported(),
+    reason="creating symlinks is not supported here",
+)
+
+
+_CREDS_JSON = json.dumps({"claudeAiOauth": {"token": "test"}})
+_FILTERED_INPUT = {
+    "oauthAccount": "user@example.com",
+    "hasCompletedOnboarding": True,
+    "installMethod": "npm",
+    "dangerousKey": "should-be-removed",
+}
+_FILTERED_EXPECTED_KEYS = {"oauthAccount", "hasCompletedOnboarding", "installMethod"}
+_SETTINGS_JSON = json.dumps(_FILTERED_INPUT)
+
+
+@pytest.fixture(scope="module")
+def claude():
+    """One ClaudeTarget for the module; targets hold no per-test state."""
+    return ClaudeTarget()
+
+
+@pytest.fixture(scope="module")
+def host_home_template(tmp_path_factory):
+    """Fake host home with Claude credentials and settings, built once."""
+    root = tmp_path_factory.mktemp("host_home_tmpl")
+    (root / ".claude").mkdir()
+    (root / ".claude" / ".credentials.json").write_text(_CREDS_JSON)
+    (root / ".claude.json").write_text(_SETTINGS_JSON)
+    return root
+
+
+@pytest.fixture
+def host_home(tmp_path, host_home_template, monkeypatch):
+    """Per-test copy of the fake host home, installed as ``$HOME``."""
+    dest = tmp_path / "fake_user_home"
+    shutil.copytree(host_home_template, dest)
+    monkeypatch.setenv("HOME", str(dest))
+    return dest
+
 
 class TestClaudeTargetProperties:
-    def test_name(self):
-        t = ClaudeTarget()
-        assert t.name == "claude"
+    def test_name(self, claude):
+        assert claude.name == "claude"
 
-    def test_display_name(self):
-        t = ClaudeTarget()
-        assert t.display_name == "Claude Code"
+    def test_display_name(self, claude):
+        assert claude.display_name == "Claude Code"
 
 
 class TestCredentialCheckPath:
-    def test_returns_credentials_json_path(self, tmp_path):
-        t = ClaudeTarget()
-        result = t.credential_check_path(tmp_path)
+    def test_returns_credentials_json_path(self, claude, tmp_path):
+        result = claude.credential_check_path(tmp_path)
         assert result == tmp_path / ".claude" / ".credentials.json"
 
-    def test_config_dir_name(self):
-        t = ClaudeTarget()
-        assert t.config_dir_name == ".claude"
+    def test_config_dir_name(self, claude):
+        assert claude.config_dir_name == ".claude"
 
 
 class TestDetect:
-    def test_found(self, tmp_path):
+    @requires_symlinks
+    def test_found(self, claude, tmp_path):
         """Detect returns AgentInstall when claude binary exists."""
         # Create a fake claude installation.
         install_dir = tmp_path / "claude"
@@ -41,15 +97,13 @@ class TestDetect:
         versions = install_dir / "versions" / "1.0"
         versions.mkdir(parents=True)
         binary = versions / "claude-bin"
-        binary.write_text("#!/bin/sh\n")
-        binary.chmod(0o755)
+        binary.touch()
 
         symlink = tmp_path / "claude-link"
         symlink.symlink_to(binary)
 
-        t = ClaudeTarget()
-        with patch("shutil.which", return_value=str(symlink)):
-            result = t.detect()
+        with patch(_WHICH, return_value=str(symlink)):
+            result = claude.detect()
 
         assert result is not None
         assert isinstance(result, AgentInstall)
@@ -58,23 +112,20 @@ class TestDetect:
         assert result.binary == binary.resolve()
         assert result.install_dir == install_dir
 
-    def test_not_found(self):
+    def test_not_found(self, claude):
         """Detect returns None when claude is not installed."""
-        t = ClaudeTarget()
-        with patch("shutil.which", return_value=None):
-            result = t.detect()
+        with patch(_WHICH, return_value=None):
+            result = claude.detect()
         assert result is None
 
-    def test_fallback_when_no_claude_dir(self, tmp_path):
+    def test_fallback_when_no_claude_dir(self, claude, tmp_path):
         """When no 'claude' directory is found walking up, falls back to parent."""
         binary = tmp_path / "some" / "path" / "binary"
         binary.parent.mkdir(parents=True)
-        binary.write_text("#!/bin/sh\n")
-        binary.chmod(0o755)
+        binary.touch()
 
-        t = ClaudeTarget()
-        with patch("shutil.which", return_value=str(binary)):
-            result = t.detect()
+        with patch(_WHICH, return_value=str(binary)):
+            result = claude.detect()
 
         assert result is not None
         # Falls back to binary's parent (resolved)
@@ -82,8 +133,7 @@ class TestDetect:
 
 
 class TestBinaryMounts:
-    def test_mounts(self, tmp_path):
-        t = ClaudeTarget()
+    def test_mounts(self, claude, tmp_path):
         install_dir = tmp_path / "share" / "claude"
         install_dir.mkdir(parents=True)
         binary = tmp_path / "bin" / "claude"
@@ -94,7 +144,7 @@ class TestBinaryMounts:
             binary=binary,
             install_dir=install_dir,
         )
-        mounts = t.binary_mounts(install)
+        mounts = claude.binary_mounts(install)
         assert len(mounts) == 2
         assert mounts[0].source == install_dir
         assert mounts[0].destination == "/home/agent/.local/share/claude"
@@ -103,20 +153,19 @@ class TestBinaryMounts:
         assert mounts[1].destination == "/home/agent/.local/bin/claude"
         assert mounts[1].options == "ro"
 
-    def test_missing_source_skipped(self, tmp_path):
+    def test_missing_source_skipped(self, claude, tmp_path):
         """Mounts with non-existent sources are not added."""
-        t = ClaudeTarget()
         install = AgentInstall(
             name="claude",
             binary=tmp_path / "nonexistent" / "claude",
             install_dir=tmp_path / "nonexistent" / "share",
         )
-        mounts = t.binary_mounts(install)
+        mounts = claude.binary_mounts(install)
         assert len(mounts) == 0
 
 
 class TestInitHome:
-    def test_creates_claude_dir(self, tmp_path, monkeypatch):
+    def test_creates_claude_dir(self, claude, tmp_path, monkeypatch):
         """init_home creates .claude/ directory in home."""
         home = tmp_path / "home"
         home.mkdir()
@@ -124,72 +173,42 @@ class TestInitHome:
         # No host files to copy.
         fake_home = tmp_path / "fake_user_home"
         fake_home.mkdir()
-        monkeypatch.setattr(Path, "home", staticmethod(lambda: fake_home))
+        monkeypatch.setenv("HOME", str(fake_home))
 
-        t = ClaudeTarget()
-        t.init_home(home)
+        claude.init_home(home)
 
         assert (home / ".claude").is_dir()
         assert (home / ".claude.json").exists()
 
-    def test_copies_host_credentials(self, tmp_path, monkeypatch):
+    def test_copies_host_credentials(self, claude, tmp_path, host_home):
         """init_home copies .credentials.json from host."""
         home = tmp_path / "home"
         home.mkdir()
 
-        fake_home = tmp_path / "fake_user_home"
-        (fake_home / ".claude").mkdir(parents=True)
-        creds = {"claudeAiOauth": {"token": "test"}}
-        (fake_home / ".claude" / ".credentials.json").write_text(json.dumps(creds))
-        monkeypatch.setattr(Path, "home", staticmethod(lambda: fake_home))
-
-        t = ClaudeTarget()
-        t.init_home(home)
+        claude.init_home(home)
 
         copied = home / ".claude" / ".credentials.json"
         assert copied.is_file()
-        assert json.loads(copied.read_text())["claudeAiOauth"]["token"] == "test"
+        assert copied.read_text() == _CREDS_JSON
 
-    def test_copies_filtered_settings(self, tmp_path, monkeypatch):
+    def test_copies_filtered_settings(self, claude, tmp_path, host_home):
         """init_home copies filtered .claude.json from host."""
         home = tmp_path / "home"
         home.mkdir()
 
-        fake_home = tmp_path / "fake_user_home"
-        fake_home.mkdir()
-        settings = {
-            "oauthAccount": "user@example.com",
-            "hasCompletedOnboarding": True,
-            "installMethod": "npm",
-            "dangerousKey": "should-be-removed",
-        }
-        (fake_home / ".claude.json").write_text(json.dumps(settings))
-        monkeypatch.setattr(Path, "home", staticmethod(lambda: fake_home))
-
-        t = ClaudeTarget()
-        t.init_home(home)
+        claude.init_home(home)
 
         result = json.loads((home / ".claude.json").read_text())
-        assert result["oauthAccount"] == "user@example.com"
-        assert result["hasCompletedOnboarding"] is True
-        assert "dangerousKey" not in result
+        assert result == {k: _FILTERED_INPUT[k] for k in _FILTERED_EXPECTED_KEYS}
 
 
 class TestInitHomeDistinctAuth:
-    def test_distinct_auth_skips_credential_copy(self, tmp_path, monkeypatch):
+    def test_distinct_auth_skips_credential_copy(self, claude, tmp_path, host_home):
         """init_home with group_auth=False skips credential copy."""
         home = tmp_path / "home"
         home.mkdir()
 
-        fake_home = tmp_path / "fake_user_home"
-        (fake_home / ".claude").mkdir(parents=True)
-        creds = {"claudeAiOauth": {"token": "test"}}
-        (fake_home / ".claude" / ".credentials.json").write_text(json.dumps(creds))
-        (fake_home / ".claude.json").write_text(json.dumps({"oauthAccount": "x"}))
-        monkeypatch.setattr(Path, "home", staticmethod(lambda: fake_home))
-
-        t = ClaudeTarget()
-        t.init_home(home, group_auth=False)
+        claude.init_home(home, group_auth=False)
 
         assert (home / ".claude").is_dir()
         assert not (home / ".claude" / ".credentials.json").exists()
@@ -197,255 +216,178 @@ class TestInitHomeDistinctAuth:
         assert (home / ".claude.json").exists()
         assert (home / ".claude.json").read_text() == ""
 
-    def test_shared_auth_copies_credentials(self, tmp_path, monkeypatch):
+    def test_shared_auth_copies_credentials(self, claude, tmp_path, host_home):
         """init_home with group_auth=True (default) copies credentials."""
         home = tmp_path / "home"
         home.mkdir()
 
-        fake_home = tmp_path / "fake_user_home"
-        (fake_home / ".claude").mkdir(parents=True)
-        creds = {"claudeAiOauth": {"token": "test"}}
-        (fake_home / ".claude" / ".credentials.json").write_text(json.dumps(creds))
-        monkeypatch.setattr(Path, "home", staticmethod(lambda: fake_home))
-
-        t = ClaudeTarget()
-        t.init_home(home, group_auth=True)
+        claude.init_home(home, group_auth=True)
 
         copied = home / ".claude" / ".credentials.json"
         assert copied.is_file()
-        assert json.loads(copied.read_text())["claudeAiOauth"]["token"] == "test"
+        assert copied.read_text() == _CREDS_JSON
+
+
+_DEFAULT_FLAGS = dict(
+    safe_mode=False, resume_mode=False,
+    new_session=False, is_new_project=False,
+    extra_args=[],
+)
 
 
 class TestBuildCliArgs:
-    def test_default(self):
-        t = ClaudeTarget()
-        args = t.build_cli_args(
-            safe_mode=False, resume_mode=False,
-            new_session=False, is_new_project=False,
-            extra_args=[],
-        )
-        assert "--dangerously-skip-permissions" in args
-        assert "--continue" in args
-
-    def test_safe_mode(self):
-        t = ClaudeTarget()
-        args = t.build_cli_args(
-            safe_mode=True, resume_mode=False,
-            new_session=False, is_new_project=False,
-            extra_args=[],
-        )
-        assert "--dangerously-skip-permissions" not in args
-        assert "--continue" in args
-
-    def test_resume_mode(self):
-        t = ClaudeTarget()
-        args = t.build_cli_args(
-            safe_mode=False, resume_mode=True,
-            new_session=False, is_new_project=False,
-            extra_args=[],
-        )
-        assert "--resume" in args
-        assert "--continue" not in args
-
-    def test_new_session(self):
-        t = ClaudeTarget()
-        args = t.build_cli_args(
-            safe_mode=False, resume_mode=False,
-            new_session=True, is_new_project=False,
-            extra_args=[],
-        )
-        assert "--continue" not in args
-
-    def test_new_project(self):
-        t = ClaudeTarget()
-        args = t.build_cli_args(
-            safe_mode=False, resume_mode=False,
-            new_session=False, is_new_project=True,
-            extra_args=[],
-        )
-        assert "--continue" not in args
-
-    def test_extra_args_resume_flag(self):
-        t = ClaudeTarget()
-        args = t.build_cli_args(
-            safe_mode=False, resume_mode=False,
-            new_session=False, is_new_project=False,
-            extra_args=["--resume"],
-        )
-        assert "--continue" not in args
-        assert "--resume" in args
-
-    def test_extra_args_passed_through(self):
-        t = ClaudeTarget()
-        args = t.build_cli_args(
-            safe_mode=False, resume_mode=False,
-            new_session=False, is_new_project=False,
-            extra_args=["--foo", "bar"],
-        )
-        assert "--foo" in args
-        assert "bar" in args
-
-    def test_extra_args_r_flag(self):
-        t = ClaudeTarget()
-        args = t.build_cli_args(
-            safe_mode=False, resume_mode=False,
-            new_session=False, is_new_project=False,
-            extra_args=["-r"],
-        )
-        assert "--continue" not in args
+    @pytest.mark.parametrize(
+        "overrides, present, absent",
+        [
+            ({}, ["--dangerously-skip-permissions", "--continue"], []),
+            ({"safe_mode": True}, ["--continue"], ["--dangerously-skip-permissions"]),
+            ({"resume_mode": True}, ["--resume"], ["--continue"]),
+            ({"new_session": True}, [], ["--continue"]),
+            ({"is_new_project": True}, [], ["--continue"]),
+            ({"extra_args": ["--resume"]}, ["--resume"], ["--continue"]),
+            ({"extra_args": ["--foo", "bar"]}, ["--foo", "bar"], []),
+            ({"extra_args": ["-r"]}, [], ["--continue"]),
+        ],
+        ids=[
+            "default", "safe_mode", "resume_mode", "new_session", "new_project",
+            "extra_args_resume_flag", "extra_args_passed_through", "extra_args_r_flag",
+        ],
+    )
+    def test_flags(self, claude, overrides, present, absent):
+        args = claude.build_cli_args(**{**_DEFAULT_FLAGS, **overrides})
+        for flag in present:
+            assert flag in args
+        for flag in absent:
+            assert flag not in args
+
+
+@contextmanager
+def patched_claude(which, runs):
+    """Patch ``shutil.which`` and ``subprocess.run`` as seen by the Claude plugin."""
+    with patch(_WHICH, return_value=which), patch(_SUBPROC, side_effect=runs) as run:
+        yield run
+
+
+def _status(logged_in):
+    return MagicMock(returncode=0, stdout=json.dumps({"loggedIn": logged_in}))
 
 
 class TestCheckAuth:
-    def test_logged_in_returns_true(self):
-        """check_auth returns True when status shows loggedIn."""
-        t = ClaudeTarget()
-        status_result = MagicMock(
-            returncode=0,
-            stdout=json.dumps({"loggedIn": True}),
-        )
-        with patch("kanibako.plugins.claude.target.shutil.which", return_value="/usr/bin/claude"):
-            with patch("kanibako.plugins.claude.target.subprocess.run", return_value=status_result):
-                assert t.check_auth() is True
-
-    def test_not_logged_in_triggers_login(self):
-        """check_auth runs login when status shows not loggedIn."""
-        t = ClaudeTarget()
-        status_not_logged = MagicMock(
-            returncode=0,
-            stdout=json.dumps({"loggedIn": False}),
-        )
-        login_result = MagicMock(returncode=0)
-        status_after_login = MagicMock(
-            returncode=0,
-            stdout=json.dumps({"loggedIn": True}),
-        )
-        with patch("kanibako.plugins.claude.target.shutil.which", return_value="/usr/bin/claude"):
-            with patch("kanibako.plugins.claude.target.subprocess.run",
-                       side_effect=[status_not_logged, login_result, status_after_login]):
-                assert t.check_auth() is True
-
-    def test_login_fails_returns_false(self):
-        """check_auth returns False when login fails."""
-        t = ClaudeTarget()
-        status_not_logged = MagicMock(
-            returncode=0,
-            stdout=json.dumps({"loggedIn": False}),
-        )
-        login_result = MagicMock(returncode=1)
-        with patch("kanibako.plugins.claude.target.shutil.which", return_value="/usr/bin/claude"):
-            with patch("kanibako.plugins.claude.target.subprocess.run",
-                       side_effect=[status_not_logged, login_result]):
-                assert t.check_auth() is False
-
-    def test_binary_not_found_returns_true(self):
-        """check_auth returns True when claude binary is not found."""
-        t = ClaudeTarget()
-        with patch("kanibako.plugins.claude.target.shutil.which", return_value=None):
-            assert t.check_auth() is True
-
-    def test_status_command_fails_returns_true(self):
-        """check_auth returns True when auth status command fails."""
-        t = ClaudeTarget()
-        status_result = MagicMock(returncode=1, stdout="")
-        with patch("kanibako.plugins.claude.target.shutil.which", return_value="/usr/bin/claude"):
-            with patch("kanibako.plugins.claude.target.subprocess.run", return_value=status_result):
-                assert t.check_auth() is True
+    @pytest.mark.parametrize(
+        "which, runs, expected",
+        [
+            # Status shows loggedIn.
+            ("/usr/bin/claude", [_status(True)], True),
+            # Not logged in: login runs, then status is re-checked.
+            (
+                "/usr/bin/claude",
+                [_status(False), MagicMock(returncode=0), _status(True)],
+                True,
+            ),
+            # Login fails.
+            ("/usr/bin/claude", [_status(False), MagicMock(returncode=1)], False),
+            # claude binary is not found.
+            (None, [], True),
+            # The auth status command itself fails.
+            ("/usr/bin/claude", [MagicMock(returncode=1, stdout="")], True),
+        ],
+        ids=[
+            "logged_in", "login_succeeds", "login_fails",
+            "binary_not_found", "status_command_fails",
+        ],
+    )
+    def test_check_auth(self, claude, which, runs, expected):
+        with patched_claude(which, runs):
+            assert claude.check_auth() is expected
 
 
 class TestRefreshCredentials:
-    def test_calls_credential_function(self, tmp_path, monkeypatch):
+    def test_calls_credential_function(self, claude, tmp_path, host_home):
         """refresh_credentials delegates to refresh_host_to_project."""
         home = tmp_path / "home"
         (home / ".claude").mkdir(parents=True)
 
-        fake_home = tmp_path / "fake_user_home"
-        (fake_home / ".claude").mkdir(parents=True)
-        monkeypatch.setattr(Path, "home", staticmethod(lambda: fake_home))
-
-        t = ClaudeTarget()
         with patch("kanibako.plugins.claude.target.refresh_host_to_project") as m_h2p:
-            t.refresh_credentials(home)
+            claude.refresh_credentials(home)
 
         m_h2p.assert_called_once()
         host_creds = m_h2p.call_args[0][0]
         project_creds = m_h2p.call_args[0][1]
-        assert host_creds == fake_home / ".claude" / ".credentials.json"
+        assert host_creds == host_home / ".claude" / ".credentials.json"
         assert project_creds == home / ".claude" / ".credentials.json"
 
 
+@pytest.fixture(scope="module")
+def mapping_by_path(claude):
+    """``{path: scope}`` for ClaudeTarget's resource mappings, built once."""
+    return {m.path: m.scope for m in claude.resource_mappings()}
+
+
 class TestResourceMappings:
-    def test_returns_list(self):
-        t = ClaudeTarget()
-        mappings = t.resource_mappings()
+    def test_returns_list(self, claude):
+        mappings = claude.resource_mappings()
         assert isinstance(mappings, list)
         assert len(mappings) > 0
 
-    def test_all_entries_are_resource_mappings(self):
-        t = ClaudeTarget()
-        for m in t.resource_mappings():
+    def test_all_entries_are_resource_mappings(self, claude):
+        for m in claude.resource_mappings():
             assert isinstance(m, ResourceMapping)
 
-    def test_no_shared_resources(self):
+    def test_no_shared_resources(self, mapping_by_path):
         """Plugins moved to a crab-scoped default share; no SHARED mappings remain."""
-        t = ClaudeTarget()
-        mappings = {m.path: m.scope for m in t.resource_mappings()}
-        assert "plugins/" not in mappings
-        shared = [p for p, s in mappings.items() if s == ResourceScope.SHARED]
+        assert "plugins/" not in mapping_by_path
+        shared = [p for p, s in mapping_by_path.items() if s == ResourceScope.SHARED]
         assert shared == []
 
-    def test_default_shares(self):
+    def test_default_shares(self, claude):
         """Plugins are declared as a crab-scoped rw default share."""
-        t = ClaudeTarget()
-        assert t.default_shares() == {
+        assert claude.default_shares() == {
             "crab.path.share_rw.plugins": "plugins:~/.claude/plugins"
         }
 
-    def test_seeded_resources(self):
-        """settings.json and CLAUDE.md are seeded from workset."""
-        t = ClaudeTarget()
-        mappings = {m.path: m.scope for m in t.resource_mappings()}
-        assert mappings["settings.json"] == ResourceScope.SEEDED
-        assert mappings["CLAUDE.md"] == ResourceScope.SEEDED
-
-    def test_project_resources(self):
-        """Session data, history, tasks, etc. are project-scoped."""
-        t = ClaudeTarget()
-        mappings = {m.path: m.scope for m in t.resource_mappings()}
-        project_paths = [
-            "projects/", "session-env/", "history.jsonl", "tasks/",
-            "todos/", "plans/", "file-history/", "backups/",
-            "debug/", "paste-cache/", "shell-snapshots/",
-        ]
-        for path in project_paths:
-            assert mappings[path] == ResourceScope.PROJECT, f"{path} should be PROJECT"
+    @pytest.mark.parametrize("path, scope", [
+        # Seeded from workset.
+        ("settings.json", ResourceScope.SEEDED),
+        ("CLAUDE.md", ResourceScope.SEEDED),
+        # Session data, history, tasks, etc.
+        ("projects/", ResourceScope.PROJECT),
+        ("session-env/", ResourceScope.PROJECT),
+        ("history.jsonl", ResourceScope.PROJECT),
+        ("tasks/", ResourceScope.PROJECT),
+        ("todos/", ResourceScope.PROJECT),
+        ("plans/", ResourceScope.PROJECT),
+        ("file-history/", ResourceScope.PROJECT),
+        ("backups/", ResourceScope.PROJECT),
+        ("debug/", ResourceScope.PROJECT),
+        ("paste-cache/", ResourceScope.PROJECT),
+        ("shell-snapshots/", ResourceScope.PROJECT),
+    ])
+    def test_scope(self, mapping_by_path, path, scope):
+        assert mapping_by_path[path] == scope
 
 
 class TestSettingDescriptors:
-    def test_returns_list_of_target_settings(self):
-        t = ClaudeTarget()
-        descriptors = t.setting_descriptors()
+    def test_returns_list_of_target_settings(self, claude):
+        descriptors = claude.setting_descriptors()
         assert isinstance(descriptors, list)
         assert all(isinstance(d, TargetSetting) for d in descriptors)
 
-    def test_model_setting(self):
-        t = ClaudeTarget()
-        descriptors = {d.key: d for d in t.setting_descriptors()}
+    def test_model_setting(self, claude):
+        descriptors = {d.key: d for d in claude.setting_descriptors()}
         assert "model" in descriptors
         assert descriptors["model"].default == "opus"
         assert descriptors["model"].choices == ()  # freeform
 
-    def test_access_setting(self):
-        t = ClaudeTarget()
-        descriptors = {d.key: d for d in t.setting_descriptors()}
+    def test_access_setting(self, claude):
+        descriptors = {d.key: d for d in claude.setting_descriptors()}
         assert "access" in descriptors
         assert descriptors["access"].default == "permissive"
         assert descriptors["access"].choices == ("permissive", "default")
 
 
 class TestGenerateCrabConfig:
-    def test_returns_claude_defaults(self):
-        t = ClaudeTarget()
-        cfg = t.generate_crab_config()
+    def test_returns_claude_defaults(self, claude):
+        cfg = claude.generate_crab_config()
         assert cfg.name == "Claude Code"
         assert cfg.shell == "standard"
         assert cfg.state == {"model": "opus", "access": "permissive"}
@@ -453,53 +395,34 @@ class TestGenerateCrabConfig:
         assert cfg.run_args == []
         assert cfg.env == {}
 
-    def test_is_crab_config_instance(self):
+    def test_is_crab_config_instance(self, claude):
         from kanibako.crabs import CrabConfig
-        t = ClaudeTarget()
-        cfg = t.generate_crab_config()
+        cfg = claude.generate_crab_config()
         assert isinstance(cfg, CrabConfig)
 
 
 class TestApplyState:
-    def test_model_translated_to_cli_arg(self):
-        t = ClaudeTarget()
-        cli_args, env_vars = t.apply_state({"model": "opus"})
-        assert cli_args == ["--model", "opus"]
-        assert env_vars == {}
-
-    def test_unknown_keys_ignored(self):
-        t = ClaudeTarget()
-        cli_args, env_vars = t.apply_state({"unknown_key": "value"})
-        assert cli_args == []
-        assert env_vars == {}
-
-    def test_empty_state(self):
-        t = ClaudeTarget()
-        cli_args, env_vars = t.apply_state({})
-        assert cli_args == []
+    @pytest.mark.parametrize("state, expected_cli", [
+        ({"model": "opus"}, ["--model", "opus"]),
+        ({"unknown_key": "value"}, []),
+        ({}, []),
+        ({"model": "sonnet", "access": "permissive"}, ["--model", "sonnet"]),
+        ({"model": ""}, []),
+    ], ids=["model", "unknown-keys", "empty", "model-with-other-keys", "empty-model"])
+    def test_apply_state(self, claude, state, expected_cli):
+        cli_args, env_vars = claude.apply_state(state)
+        assert cli_args == expected_cli
         assert env_vars == {}
 
-    def test_model_with_other_keys(self):
-        t = ClaudeTarget()
-        cli_args, env_vars = t.apply_state({"model": "sonnet", "access": "permissive"})
-        assert cli_args == ["--model", "sonnet"]
-        assert env_vars == {}
-
-    def test_empty_model_not_added(self):
-        t = ClaudeTarget()
-        cli_args, env_vars = t.apply_state({"model": ""})
-        assert cli_args == []
-
 
 class TestWritebackCredentials:
-    def test_calls_writeback(self, tmp_path):
+    def test_calls_writeback(self, claude, tmp_path):
         """writeback_credentials delegates to writeback_project_to_host."""
         home = tmp_path / "home"
         (home / ".claude").mkdir(parents=True)
 
-        t = ClaudeTarget()
         with patch("kanibako.plugins.claude.target.writeback_project_to_host") as m_wb:
-            t.writeback_credentials(home)
+            claude.writeback_credentials(home)
 
         m_wb.assert_called_once()
         project_creds = m_wb.call_args[0][0]
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
 
@@ -47,6 +48,8 @@ class _FakeTarget(Target):
 class _DetectableTarget(_FakeTarget):
     """Target whose detect() returns a valid install."""
 
+    _INSTALL = AgentInstall(name="detectable", binary=Path("/bin/x"), install_dir=Path("/opt/x"))
+
     @property
     def name(self) -> str:
         return "detectable"
@@ -56,86 +59,105 @@ class _DetectableTarget(_FakeTarget):
         return "Detectable Agent"
 
     def detect(self):
-        return AgentInstall(name="detectable", binary=Path("/bin/x"), install_dir=Path("/opt/x"))
+        return self._INSTALL
+
+
+@dataclass(frozen=True, slots=True)
+class _EP:
+    """Minimal stand-in for an ``importlib.metadata.EntryPoint``."""
+
+    name: str
+    _cls: type
+
+    def load(self) -> type:
+        return self._cls
+
+
+_mock_entry_point = _EP
+
+
+@pytest.fixture
+def patched_eps(request, monkeypatch):
+    """Patch ``entry_points`` to return the prebuilt entry points in the param.
 
+    Parametrize via :func:`_with_eps`.
+    """
+    eps = request.param
+    monkeypatch.setattr("kanibako.targets.entry_points", lambda group=None: eps)
+    return eps
 
-def _mock_entry_point(name: str, cls: type) -> MagicMock:
-    ep = MagicMock()
-    ep.name = name
-    ep.load.return_value = cls
-    return ep
+
+def _with_eps(*specs):
+    """Parametrize a test with entry points for ``(name, cls)`` *specs*.
+
+    The entry points are built here, at import time, so each spec is
+    constructed once per module rather than once per test.
+    """
+    eps = [_mock_entry_point(name, cls) for name, cls in specs]
+    return pytest.mark.parametrize("patched_eps", [eps], indirect=True)
 
 
 class TestDiscoverTargets:
-    def test_discovers_registered_targets(self):
-        ep = _mock_entry_point("fake", _FakeTarget)
-        with patch("kanibako.targets.entry_points", return_value=[ep]):
-            targets = discover_targets()
+    @_with_eps(("fake", _FakeTarget))
+    def test_discovers_registered_targets(self, patched_eps):
+        targets = discover_targets()
         assert "fake" in targets
         assert targets["fake"] is _FakeTarget
 
-    def test_empty_when_no_targets(self):
-        with patch("kanibako.targets.entry_points", return_value=[]):
-            targets = discover_targets()
+    @_with_eps()
+    def test_empty_when_no_targets(self, patched_eps):
+        targets = discover_targets()
         assert targets == {}
 
-    def test_multiple_targets(self):
-        ep1 = _mock_entry_point("a", _FakeTarget)
-        ep2 = _mock_entry_point("b", _DetectableTarget)
-        with patch("kanibako.targets.entry_points", return_value=[ep1, ep2]):
-            targets = discover_targets()
+    @_with_eps(("a", _FakeTarget), ("b", _DetectableTarget))
+    def test_multiple_targets(self, patched_eps):
+        targets = discover_targets()
         assert len(targets) == 2
         assert "a" in targets
         assert "b" in targets
 
 
 class TestGetTarget:
-    def test_found(self):
-        ep = _mock_entry_point("fake", _FakeTarget)
-        with patch("kanibako.targets.entry_points", return_value=[ep]):
-            cls = get_target("fake")
+    @_with_eps(("fake", _FakeTarget))
+    def test_found(self, patched_eps):
+        cls = get_target("fake")
         assert cls is _FakeTarget
 
-    def test_not_found(self):
-        with patch("kanibako.targets.entry_points", return_value=[]):
-            with pytest.raises(KeyError, match="Unknown target 'nope'"):
-                get_target("nope")
+    @_with_eps()
+    def test_not_found(self, patched_eps):
+        with pytest.raises(KeyError, match="Unknown target 'nope'"):
+            get_target("nope")
 
 
 class TestResolveTarget:
-    def test_resolve_by_name(self):
-        ep = _mock_entry_point("fake", _FakeTarget)
-        with patch("kanibako.targets.entry_points", return_value=[ep]):
-            t = resolve_target("fake")
+    @_with_eps(("fake", _FakeTarget))
+    def test_resolve_by_name(self, patched_eps):
+        t = resolve_target("fake")
         assert isinstance(t, _FakeTarget)
 
-    def test_resolve_by_name_not_found(self):
-        with patch("kanibako.targets.entry_points", return_value=[]):
-            with pytest.raises(KeyError):
-                resolve_target("missing")
+    @_with_eps()
+    def test_resolve_by_name_not_found(self, patched_eps):
+        with pytest.raises(KeyError):
+            resolve_target("missing")
 
-    def test_auto_detect(self):
-        ep = _mock_entry_point("detectable", _DetectableTarget)
-        with patch("kanibako.targets.entry_points", return_value=[ep]):
-            t = resolve_target()
+    @_with_eps(("detectable", _DetectableTarget))
+    def test_auto_detect(self, patched_eps):
+        t = resolve_target()
         assert isinstance(t, _DetectableTarget)
 
-    def test_auto_detect_skips_undetectable(self):
-        ep1 = _mock_entry_point("fake", _FakeTarget)
-        ep2 = _mock_entry_point("detectable", _DetectableTarget)
-        with patch("kanibako.targets.entry_points", return_value=[ep1, ep2]):
-            t = resolve_target()
+    @_with_eps(("fake", _FakeTarget), ("detectable", _DetectableTarget))
+    def test_auto_detect_skips_undetectable(self, patched_eps):
+        t = resolve_target()
         assert isinstance(t, _DetectableTarget)
 
-    def test_auto_detect_none_found_returns_no_agent(self):
-        ep = _mock_entry_point("fake", _FakeTarget)
-        with patch("kanibako.targets.entry_points", return_value=[ep]):
-            t = resolve_target()
+    @_with_eps(("fake", _FakeTarget))
+    def test_auto_detect_none_found_returns_no_agent(self, patched_eps):
+        t = resolve_target()
         assert isinstance(t, NoAgentTarget)
 
-    def test_auto_detect_empty_returns_no_agent(self):
-        with patch("kanibako.targets.entry_points", return_value=[]):
-            t = resolve_target()
+    @_with_eps()
+    def test_auto_detect_empty_returns_no_agent(self, patched_eps):
+        t = resolve_target()
         assert isinstance(t, NoAgentTarget)
 
 
@@ -2,50 +2,61 @@
 
 from __future__ import annotations
 
-from kanibako.targets.no_agent import NoAgentTarget
-
-
-class TestNoAgentTarget:
-    def setup_method(self):
-        self.target = NoAgentTarget()
-
-    def test_name(self):
-        assert self.target.name == "no_agent"
+import pytest
 
-    def test_display_name(self):
-        assert self.target.display_name == "Shell"
+from kanibako.targets.no_agent import NoAgentTarget
 
-    def test_has_binary_false(self):
-        assert self.target.has_binary is False
 
-    def test_detect_returns_none(self):
-        assert self.target.detect() is None
+@pytest.fixture(scope="module")
+def target():
+    """One NoAgentTarget for the module; it holds no per-test state."""
+    return NoAgentTarget()
 
-    def test_binary_mounts_empty(self):
-        assert self.target.binary_mounts(None) == []
 
-    def test_init_home_is_noop(self, tmp_path):
+class TestNoAgentTarget:
+    @pytest.mark.parametrize("attr, expected", [
+        ("name", "no_agent"),
+        ("display_name", "Shell"),
+        ("has_binary", False),
+    ])
+    def test_property(self, target, attr, expected):
+        value = getattr(target, attr)
+        assert value == expected
+        assert type(value) is type(expected)
+
+    @pytest.mark.parametrize("method, args, expected", [
+        ("detect", (), None),
+        ("binary_mounts", (None,), []),
+        ("check_auth", (), True),
+        ("resource_mappings", (), []),
+    ])
+    def test_trivial_return(self, target, method, args, expected):
+        result = getattr(target, method)(*args)
+        assert result == expected
+        assert type(result) is type(expected)
+
+    def test_init_home_is_noop(self, target, tmp_path):
         """init_home should not create any files."""
         home = tmp_path / "shell"
         home.mkdir()
-        self.target.init_home(home)
+        target.init_home(home)
         # Only the dir we created should exist
         assert list(home.iterdir()) == []
 
-    def test_init_home_distinct_auth(self, tmp_path):
+    def test_init_home_distinct_auth(self, target, tmp_path):
         home = tmp_path / "shell"
         home.mkdir()
-        self.target.init_home(home, group_auth=False)
+        target.init_home(home, group_auth=False)
         assert list(home.iterdir()) == []
 
-    def test_refresh_credentials_is_noop(self, tmp_path):
-        self.target.refresh_credentials(tmp_path)
+    def test_refresh_credentials_is_noop(self, target, tmp_path):
+        target.refresh_credentials(tmp_path)
 
-    def test_writeback_credentials_is_noop(self, tmp_path):
-        self.target.writeback_credentials(tmp_path)
+    def test_writeback_credentials_is_noop(self, target, tmp_path):
+        target.writeback_credentials(tmp_path)
 
-    def test_build_cli_args_empty(self):
-        result = self.target.build_cli_args(
+    def test_build_cli_args_empty(self, target):
+        result = target.build_cli_args(
             safe_mode=False,
             resume_mode=False,
             new_session=False,
@@ -54,19 +65,13 @@ class TestNoAgentTarget:
         )
         assert result == []
 
-    def test_check_auth_returns_true(self):
-        assert self.target.check_auth() is True
-
-    def test_resource_mappings_empty(self):
-        assert self.target.resource_mappings() == []
-
-    def test_apply_state_returns_empty(self):
-        cli_args, env_vars = self.target.apply_state({"model": "opus"})
+    def test_apply_state_returns_empty(self, target):
+        cli_args, env_vars = target.apply_state({"model": "opus"})
         assert cli_args == []
         assert env_vars == {}
 
-    def test_generate_crab_config(self):
-        cfg = self.target.generate_crab_config()
+    def test_generate_crab_config(self, target):
+        cfg = target.generate_crab_config()
         assert cfg.name == "Shell"
         assert cfg.shell == "standard"
         assert cfg.run_args == []
@@ -2,6 +2,11 @@
 
 from __future__ import annotations
 
+import os
+import stat
+from pathlib import Path
+from unittest.mock import patch
+
 from kanibako.templates import apply_shell_template, resolve_template
 
 
@@ -126,6 +131,15 @@ class TestApplyShellTemplate:
         assert (shell / "existing.txt").read_text() == "untouched"
         assert sorted(p.name for p in shell.iterdir()) == ["existing.txt"]
 
+    def test_empty_sentinel_touches_no_files(self, tmp_path):
+        """'empty' returns before any filesystem lookups."""
+        no_io = AssertionError("unexpected filesystem access")
+        with (
+            patch.object(Path, "is_dir", side_effect=no_io),
+            patch("os.scandir", side_effect=no_io),
+        ):
+            apply_shell_template(tmp_path / "shell", tmp_path / "templates", "claude", "empty")
+
     def test_nested_directories(self, tmp_path):
         """Template with nested directory structure is copied correctly."""
         templates = tmp_path / "templates"
@@ -170,3 +184,22 @@ class TestApplyShellTemplate:
         apply_shell_template(shell, templates, "claude")
 
         assert (shell / "agent-only.txt").read_text() == "agent content"
+
+    def test_preserves_mode_and_mtime(self, tmp_path):
+        """Copied files keep the template's permission bits and mtime."""
+        templates = tmp_path / "templates"
+        shell = tmp_path / "shell"
+        shell.mkdir()
+
+        agent_dir = templates / "claude" / "standard"
+        agent_dir.mkdir(parents=True)
+        script = agent_dir / "run.sh"
+        script.write_text("#!/bin/sh\n")
+        script.chmod(0o750)
+        os.utime(script, ns=(1_000_000_000, 2_000_000_000))
+
+        apply_shell_template(shell, templates, "claude")
+
+        st = (shell / "run.sh").stat()
+        assert stat.S_IMODE(st.st_mode) == 0o750
+        assert st.st_mtime_ns == 2_000_000_000
@@ -58,6 +58,17 @@ class TestCpIfNewer:
         assert cp_if_newer(tmp_path / "nope.txt", dst) is False
         assert not dst.exists()
 
+    def test_preserves_mode_and_mtime(self, tmp_path):
+        src = tmp_path / "src.txt"
+        dst = tmp_path / "dst.txt"
+        src.write_text("secret")
+        src.chmod(0o600)
+        os.utime(src, ns=(1_000_000_001, 2_000_000_001))
+        assert cp_if_newer(src, dst) is True
+        st = dst.stat()
+        assert st.st_mode & 0o777 == 0o600
+        assert st.st_mtime_ns == 2_000_000_001
+
     def test_creates_parent_dirs(self, tmp_path):
         src = tmp_path / "src.txt"
         src.write_text("data")
@@ -65,6 +76,14 @@ class TestCpIfNewer:
         assert cp_if_newer(src, dst) is True
         assert dst.read_text() == "data"
 
+    def test_copies_into_existing_dir(self, tmp_path):
+        src = tmp_path / "src.txt"
+        src.write_text("data")
+        dst = tmp_path / "dest"
+        dst.mkdir()
+        assert cp_if_newer(src, dst) is True
+        assert (dst / "src.txt").read_text() == "data"
+
 
 # ---------------------------------------------------------------------------
 # confirm_prompt
@@ -99,6 +118,11 @@ class TestConfirmPrompt:
         with patch("builtins.input", return_value="  yes  "):
             confirm_prompt("ok? ")  # Should not raise
 
+    def test_oversized_input_raises(self):
+        with patch("builtins.input", return_value="yes" + " " * 1_000_000):
+            with pytest.raises(UserCancelled):
+                confirm_prompt("ok? ")
+
 
 # ---------------------------------------------------------------------------
 # project_hash
@@ -310,6 +310,15 @@ class TestAddProject:
         names = {p.name for p in loaded.projects}
         assert names == {"alpha", "beta"}
 
+    def test_projects_indexed_by_name_in_order(self, std, tmp_home):
+        root = tmp_home / "worksets" / "my-set"
+        ws = create_workset("my-set", root, std)
+        beta = add_project(ws, "beta", tmp_home / "proj_b")
+        alpha = add_project(ws, "alpha", tmp_home / "proj_a")
+
+        assert ws.projects_by_name == {"beta": beta, "alpha": alpha}
+        assert [p.name for p in load_workset(root).projects] == ["beta", "alpha"]
+
 
 class TestRemoveProject:
     def test_removes_from_toml(self, std, tmp_home):
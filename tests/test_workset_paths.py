@@ -3,19 +3,33 @@
 from __future__ import annotations
 
 import json
+import os
+import shutil
+from pathlib import Path
 
 import pytest
 
-from kanibako.config import read_project_meta, write_project_meta
+from kanibako.config import load_config, read_project_meta, write_project_meta
 from kanibako.errors import WorksetError
 from kanibako.paths import (
     ProjectLayout,
     ProjectMode,
     WorksetSpec,
+    iter_workset_projects,
+    load_std_paths,
     resolve_workset_project,
 )
+from kanibako.plugins.claude.credentials import refresh_host_to_project
 from kanibako.utils import project_hash
-from kanibako.workset import add_project, create_workset, default_workset
+from kanibako.workset import add_project, create_workset, default_workset, load_workset
+
+from tests.conftest import setup_tmp_home, write_default_config, write_host_credentials
+
+
+def _scan(path):
+    """Map each entry in *path* to whether it is a directory (one scandir)."""
+    with os.scandir(path) as it:
+        return {e.name: e.is_dir(follow_symlinks=False) for e in it}
 
 
 # ---------------------------------------------------------------------------
@@ -37,15 +51,56 @@ class TestWorksetSpecFromWorkset:
 # Fixtures
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(scope="session")
+def workset_template(tmp_path_factory):
+    """A workset root with one project, built once per session.
+
+    ``workset_env`` copies this tree instead of re-running create_workset()
+    and add_project() for every test.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        tmp_home = setup_tmp_home(tmp_path_factory.mktemp("ws-template"), mp)
+        std = load_std_paths(load_config(write_default_config(tmp_home)))
+        ws = create_workset("my-set", tmp_home / "worksets" / "my-set", std)
+        source = tmp_home / "original-project"
+        source.mkdir()
+        add_project(ws, "cool-app", source)
+    return ws.root
+
+
+def _copy_workset(template, tmp_home):
+    """Copy the workset template under *tmp_home* and load it."""
+    ws_root = tmp_home / "worksets" / "my-set"
+    shutil.copytree(template, ws_root)
+    return load_workset(ws_root)
+
+
 @pytest.fixture
-def workset_env(std, config, tmp_home):
+def workset_env(workset_template, tmp_home):
     """Create a workset with one project and return (ws, project_name)."""
-    ws_root = tmp_home / "worksets" / "my-set"
-    ws = create_workset("my-set", ws_root, std)
-    source = tmp_home / "original-project"
-    source.mkdir()
-    add_project(ws, "cool-app", source)
-    return ws, "cool-app"
+    return _copy_workset(workset_template, tmp_home), "cool-app"
+
+
+@pytest.fixture(scope="class")
+def initialized_proj(workset_template, tmp_path_factory):
+    """``(ws, proj)`` for a workset project initialized once per test class.
+
+    The env patches are only active while the project is built; they are
+    undone before any test runs.  Only for tests that inspect the result of the first
+    ``initialize=True`` call; tests that re-resolve or mutate the project
+    use ``workset_env`` instead.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        tmp_home = setup_tmp_home(tmp_path_factory.mktemp("ws-init"), mp)
+        config_file = write_default_config(tmp_home)
+        write_host_credentials(tmp_home, config_file)
+        config = load_config(config_file)
+        std = load_std_paths(config)
+        ws = _copy_workset(workset_template, tmp_home)
+        proj = resolve_workset_project(
+            WorksetSpec.from_workset(ws), "cool-app", std, config, initialize=True,
+        )
+    return ws, proj
 
 
 # ---------------------------------------------------------------------------
@@ -62,50 +117,41 @@ class TestResolveWorksetProject:
         ws, name = workset_env
         proj = resolve_workset_project(WorksetSpec.from_workset(ws), name, std, config)
 
+        metadata = ws.projects_dir / name
+        vault = ws.vault_dir / name
         assert proj.project_path == ws.workspaces_dir / name
-        assert proj.metadata_path == ws.projects_dir / name
-        assert proj.shell_path == ws.projects_dir / name / "shell"
-        assert proj.vault_ro_path == ws.vault_dir / name / "ro"
-        assert proj.vault_rw_path == ws.vault_dir / name / "rw"
+        assert proj.metadata_path == metadata
+        assert proj.shell_path == metadata / "shell"
+        assert proj.vault_ro_path == vault / "ro"
+        assert proj.vault_rw_path == vault / "rw"
 
     def test_project_hash_is_sha256_of_workspace_path(self, workset_env, std, config):
         ws, name = workset_env
         proj = resolve_workset_project(WorksetSpec.from_workset(ws), name, std, config)
 
-        expected = project_hash(str((ws.workspaces_dir / name).resolve()))
-        assert proj.project_hash == expected
+        workspace = (ws.workspaces_dir / name).resolve()
+        assert proj.project_hash == project_hash(str(workspace))
 
     def test_project_not_found_raises(self, workset_env, std, config):
         ws, _ = workset_env
         with pytest.raises(WorksetError, match="not found"):
             resolve_workset_project(WorksetSpec.from_workset(ws), "nonexistent", std, config)
 
-    def test_initialize_creates_shell_path(
-        self, workset_env, std, config, credentials_dir
-    ):
-        ws, name = workset_env
-        proj = resolve_workset_project(WorksetSpec.from_workset(ws), name, std, config, initialize=True)
-
+    def test_initialize_creates_shell_path(self, initialized_proj):
+        _, proj = initialized_proj
         assert proj.shell_path.is_dir()
 
-    def test_initialize_does_not_copy_credentials(
-        self, workset_env, std, config, credentials_dir
-    ):
+    def test_initialize_does_not_copy_credentials(self, initialized_proj):
         """Credential copy is now handled by target.init_home(), not during init."""
-        ws, name = workset_env
-        proj = resolve_workset_project(WorksetSpec.from_workset(ws), name, std, config, initialize=True)
-
+        _, proj = initialized_proj
         creds_file = proj.shell_path / ".claude" / ".credentials.json"
         assert not creds_file.exists()
 
-    def test_initialize_bootstraps_shell(
-        self, workset_env, std, config, credentials_dir
-    ):
-        ws, name = workset_env
-        proj = resolve_workset_project(WorksetSpec.from_workset(ws), name, std, config, initialize=True)
-
-        assert (proj.shell_path / ".bashrc").is_file()
-        assert (proj.shell_path / ".profile").is_file()
+    def test_initialize_bootstraps_shell(self, initialized_proj):
+        _, proj = initialized_proj
+        entries = _scan(proj.shell_path)
+        assert entries.get(".bashrc") is False
+        assert entries.get(".profile") is False
 
     def test_no_initialize_skips_creation(self, workset_env, std, config):
         ws, name = workset_env
@@ -114,11 +160,8 @@ class TestResolveWorksetProject:
         assert not proj.shell_path.is_dir()
         assert not proj.is_new
 
-    def test_is_new_true_on_first_init(
-        self, workset_env, std, config, credentials_dir
-    ):
-        ws, name = workset_env
-        proj = resolve_workset_project(WorksetSpec.from_workset(ws), name, std, config, initialize=True)
+    def test_is_new_true_on_first_init(self, initialized_proj):
+        _, proj = initialized_proj
         assert proj.is_new is True
 
     def test_is_new_false_on_reinit(
@@ -135,31 +178,19 @@ class TestResolveWorksetProject:
         ws, name = workset_env
         # First init to create everything.
         proj = resolve_workset_project(WorksetSpec.from_workset(ws), name, std, config, initialize=True)
-        # Delete shell_path to simulate corruption.
-        import shutil
-        shutil.rmtree(proj.shell_path)
+        # Move shell_path aside (one rename) to simulate it going missing.
+        os.rename(proj.shell_path, proj.shell_path.with_name("shell.gone"))
         assert not proj.shell_path.exists()
 
         # Re-resolve with initialize; recovery should recreate shell_path.
         proj2 = resolve_workset_project(WorksetSpec.from_workset(ws), name, std, config, initialize=True)
         assert proj2.shell_path.is_dir()
 
-    def test_no_project_path_breadcrumb(
-        self, workset_env, std, config, credentials_dir
-    ):
-        """Workset projects should NOT create project-path.txt."""
-        ws, name = workset_env
-        proj = resolve_workset_project(WorksetSpec.from_workset(ws), name, std, config, initialize=True)
-        assert not (proj.metadata_path / "project-path.txt").exists()
-
-    def test_no_vault_gitignore(
-        self, workset_env, std, config, credentials_dir
-    ):
-        """Workset projects should NOT create .gitignore in vault dirs."""
-        ws, name = workset_env
-        resolve_workset_project(WorksetSpec.from_workset(ws), name, std, config, initialize=True)
-        vault_proj = ws.vault_dir / name
-        assert not (vault_proj / ".gitignore").exists()
+    def test_initialize_absence_invariants(self, initialized_proj):
+        """Workset projects create neither project-path.txt nor a vault .gitignore."""
+        ws, proj = initialized_proj
+        assert "project-path.txt" not in _scan(proj.metadata_path)
+        assert ".gitignore" not in _scan(ws.vault_dir / "cool-app")
 
 
 # ---------------------------------------------------------------------------
@@ -186,7 +217,6 @@ class TestWorksetLocalSharedPath:
         ws, name = workset_env
         proj = resolve_workset_project(WorksetSpec.from_workset(ws), name, std, config, initialize=True)
 
-        from pathlib import Path
         expected = Path(ws.root) / config.paths_shared
         assert proj.local_shared_path == expected
 
@@ -208,8 +238,6 @@ class TestWorksetProjectCredentialFlow:
         ws, name = workset_env
         proj = resolve_workset_project(WorksetSpec.from_workset(ws), name, std, config, initialize=True)
 
-        from kanibako.plugins.claude.credentials import refresh_host_to_project
-
         home = tmp_home / "home"
         host_creds = home / ".claude" / ".credentials.json"
 
@@ -217,19 +245,18 @@ class TestWorksetProjectCredentialFlow:
         claude_dir = proj.shell_path / ".claude"
         claude_dir.mkdir(parents=True, exist_ok=True)
         project_creds = claude_dir / ".credentials.json"
-        project_creds.write_text(json.dumps({"claudeAiOauth": {"token": "old"}}))
+        project_creds.write_bytes(json.dumps({"claudeAiOauth": {"token": "old"}}).encode())
 
-        # Touch host to ensure it's newer.
-        import time
-        time.sleep(0.05)
-        host_creds.write_text(json.dumps(
-            {"claudeAiOauth": {"token": "refreshed-token"}}
-        ))
+        with host_creds.open("w", encoding="utf-8") as f:
+            json.dump({"claudeAiOauth": {"token": "refreshed-token"}}, f)
+        # Make the host copy strictly newer without sleeping.
+        newer = project_creds.stat().st_mtime + 1.0
+        os.utime(host_creds, (newer, newer))
 
         result = refresh_host_to_project(host_creds, project_creds)
         assert result is True
 
-        updated = json.loads(project_creds.read_text())
+        updated = json.loads(project_creds.read_bytes())
         assert updated["claudeAiOauth"]["token"] == "refreshed-token"
 
 
@@ -237,53 +264,42 @@ class TestWorksetProjectCredentialFlow:
 # TestIterWorksetProjects
 # ---------------------------------------------------------------------------
 
-class TestIterWorksetProjects:
-    def test_iter_workset_projects_normal(self, std, config, tmp_home):
-        from kanibako.paths import iter_workset_projects
-
-        ws_root = tmp_home / "worksets" / "iter-set"
-        ws = create_workset("iter-set", ws_root, std)
-        source = tmp_home / "iter-src"
-        source.mkdir()
-        add_project(ws, "proj-a", source)
+@pytest.fixture(params=["normal", "missing-ws", "missing-root"])
+def iter_case(request, std, config, tmp_home):
+    """Build a one-project workset, then break it per the param.
 
-        results = iter_workset_projects(std, config)
-        assert len(results) == 1
-        ws_name, ws_obj, project_list = results[0]
-        assert ws_name == "iter-set"
-        assert len(project_list) == 1
-        assert project_list[0] == ("proj-a", "ok")
-
-    def test_iter_workset_projects_missing_workspace(self, std, config, tmp_home):
-        import shutil
-        from kanibako.paths import iter_workset_projects
-
-        ws_root = tmp_home / "worksets" / "miss-set"
-        ws = create_workset("miss-set", ws_root, std)
-        source = tmp_home / "miss-src"
-        source.mkdir()
-        add_project(ws, "miss-proj", source)
-        # Remove workspace dir
-        shutil.rmtree(ws.workspaces_dir / "miss-proj")
-
-        results = iter_workset_projects(std, config)
-        assert len(results) == 1
-        _, _, project_list = results[0]
-        assert project_list[0] == ("miss-proj", "missing")
+    Returns ``(expected_entries, expects_warning)``.
+    """
+    ws_root = tmp_home / "worksets" / "iter-set"
+    ws = create_workset("iter-set", ws_root, std)
+    source = tmp_home / "iter-src"
+    source.mkdir()
+    add_project(ws, "proj-a", source)
 
-    def test_iter_workset_projects_missing_root(self, std, config, tmp_home, capsys):
-        import shutil
-        from kanibako.paths import iter_workset_projects
+    match request.param:
+        case "normal":
+            return [("proj-a", "ok")], False
+        case "missing-ws":
+            shutil.rmtree(ws.workspaces_dir / "proj-a")
+            return [("proj-a", "missing")], False
+        case "missing-root":
+            # Gone workset produces a warning and no entries.
+            shutil.rmtree(ws_root)
+            return None, True
 
-        ws_root = tmp_home / "worksets" / "gone-set"
-        create_workset("gone-set", ws_root, std)
-        shutil.rmtree(ws_root)
 
+class TestIterWorksetProjects:
+    def test_iter_workset_projects(self, iter_case, std, config, capsys):
+        expected_entries, expects_warning = iter_case
         results = iter_workset_projects(std, config)
-        # Gone workset produces warning, no entries
-        assert len(results) == 0
-        err = capsys.readouterr().err
-        assert "Warning" in err
+
+        if expected_entries is None:
+            assert results == []
+        else:
+            [(ws_name, _, project_list)] = results
+            assert ws_name == "iter-set"
+            assert project_list == expected_entries
+        assert ("Warning" in capsys.readouterr().err) is expects_warning
 
 
 # ---------------------------------------------------------------------------